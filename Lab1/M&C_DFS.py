@@ -1,54 +1,22 @@
-from collections import deque
+import argparse
+# The search engines are shared with Lab2; run from the repository root as
+#   PYTHONPATH=Lab2 python "Lab1/M&C_DFS.py"
+from Search_engine import dfs, format_stats
+from MC_tables import MissionariesCannibals, unpack
 
-def is_valid(state):
-    missionaries, cannibals, boat = state
-    if missionaries < 0 or cannibals < 0 or missionaries > 3 or cannibals > 3:
-        return False
-    if missionaries > 0 and missionaries < cannibals:
-        return False
-    if 3 - missionaries > 0 and 3 - missionaries < 3 - cannibals:
-        return False
-    return True
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Missionaries & Cannibals with depth-first search.")
+    parser.add_argument("--people", type=int, default=3, help="missionaries, and as many cannibals")
+    parser.add_argument("--boat", type=int, default=2, help="boat capacity")
+    args = parser.parse_args()
 
-def get_successors(state):
-    successors = []
-    missionaries, cannibals, boat = state
-    if boat == 1:
-        moves = [(2, 0), (0, 2), (1, 1), (1, 0), (0, 1)]
-        for move in moves:
-            new_state = (missionaries - move[0], cannibals - move[1], 0)
-            if is_valid(new_state):
-                successors.append(new_state)
+    problem = MissionariesCannibals(args.people, args.boat)
+    result = dfs(problem)
+    solution = result.states
+    if solution:
+        print("Solution found:")
+        for step in solution:
+            print(unpack(step, args.people))
+        print(format_stats(result))
     else:
-        moves = [(2, 0), (0, 2), (1, 1), (1, 0), (0, 1)]
-        for move in moves:
-            new_state = (missionaries + move[0], cannibals + move[1], 1)
-            if is_valid(new_state):
-                successors.append(new_state)
-    return successors
-
-def dfs(start_state, goal_state):
-    stack = [(start_state, [])]
-    visited = set()
-    while stack:
-        (state, path) = stack.pop()
-        if state in visited:
-            continue
-        visited.add(state)
-        path = path + [state]
-        if state == goal_state:
-            return path
-        for successor in get_successors(state):
-            stack.append((successor, path))
-    return None
-
-start_state = (3, 3, 1)
-goal_state = (0, 0, 0)
-
-solution = dfs(start_state, goal_state)
-if solution:
-    print("Solution found:")
-    for step in solution:
-        print(step)
-else:
-    print("No solution found.")
\ No newline at end of file
+        print("No solution found.")
@@ -0,0 +1,137 @@
+import argparse
+import time
+import numpy as np
+# The search engines are shared with Lab2; run from the repository root as
+#   PYTHONPATH=Lab2 python Lab1/MC_tables.py
+from Search_engine import ENGINES, Problem, SearchResult, format_stats
+
+# Missionaries & Cannibals with `people` of each and a boat seating `boat`. A state
+# (m, c, boat side) counts who is still on the start bank, side being 1 while the boat is
+# there, and is packed as (m * (people + 1) + c) * 2 + side. The safe states and every
+# crossing are worked out once into flat arrays indexed by packed state.
+
+def pack(state, people):
+    m, c, side = state
+    return (m * (people + 1) + c) * 2 + side
+
+def unpack(index, people):
+    bank, side = divmod(index, 2)
+    m, c = divmod(bank, people + 1)
+    return m, c, side
+
+def safe_banks(people):
+    """A (people + 1) x (people + 1) mask over (m, c) of the start bank: neither bank may
+    have missionaries outnumbered, so m is 0, all of them, or equal to c."""
+    m, c = np.ogrid[:people + 1, :people + 1]
+    return (m == 0) | (m == people) | (m == c)
+
+def crossings(people, boat, safe):
+    # (source bank, target bank) index pairs for the boat leaving the start bank; the
+    # return trips are the same pairs reversed.
+    ms, cs = np.nonzero(safe)
+    banks = ms * (people + 1) + cs
+    sources, targets = [], []
+    if (boat + 1) * (boat + 2) // 2 <= len(banks):
+        # Few boat loads: shift every safe bank by each load (dm, dc) at once.
+        for dm in range(boat + 1):
+            for dc in range(boat + 1 - dm):
+                if dm or dc:
+                    ok = (ms >= dm) & (cs >= dc)
+                    ok[ok] = safe[ms[ok] - dm, cs[ok] - dc]
+                    sources.append(banks[ok])
+                    targets.append(banks[ok] - dm * (people + 1) - dc)
+    else:
+        # A big boat: compare each safe bank with every other one.
+        for bank, m, c in zip(banks.tolist(), ms.tolist(), cs.tolist()):
+            dm, dc = m - ms, c - cs
+            ok = (dm >= 0) & (dc >= 0) & (dm + dc >= 1) & (dm + dc <= boat)
+            sources.append(np.full(ok.sum(), bank))
+            targets.append(banks[ok])
+    return np.concatenate(sources), np.concatenate(targets)
+
+def build_tables(people, boat):
+    """Returns (valid, offsets, targets): valid[i] tells whether packed state i is safe,
+    and its successors are targets[offsets[i]:offsets[i + 1]]. The arrays span all
+    2 * (people + 1)^2 packed states, and targets grows with people * min(boat, people)."""
+    safe = safe_banks(people)
+    valid = np.repeat(safe.ravel(), 2)
+    src, dst = crossings(people, boat, safe)
+    # Leaving the start bank goes from side 1 to side 0; coming back undoes it.
+    src, dst = np.concatenate([src * 2 + 1, dst * 2]), np.concatenate([dst * 2, src * 2 + 1])
+    order = np.lexsort((dst, src))
+    src, dst = src[order], dst[order]
+    offsets = np.zeros(len(valid) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(valid)), out=offsets[1:])
+    return valid, offsets, dst
+
+class MissionariesCannibals(Problem):
+    """The puzzle over packed states, its successors read straight from the tables."""
+
+    state_type = "q"
+
+    def __init__(self, people=3, boat=2):
+        self.people, self.boat = people, boat
+        self.valid, self.offsets, self.targets = build_tables(people, boat)
+        self.start = pack((people, people, 1), people)
+        self.goal = pack((0, 0, 0), people)
+        # The engines loop in Python, where plain lists beat slicing NumPy arrays; only
+        # the safe states, a small part of the packed range, get one.
+        self.successor_lists = {state: self.targets[self.offsets[state]:self.offsets[state + 1]].tolist()
+                                for state in np.flatnonzero(self.valid).tolist()}
+
+    def successors(self, state):
+        return [(target, None) for target in self.successor_lists[state]]
+
+def table_bfs(problem):
+    """Breadth-first search done a whole layer at a time in NumPy over the tables; the
+    parent array doubles as the visited set. Shortest in crossings."""
+    start_time = time.time()
+    offsets, targets = problem.offsets, problem.targets
+    parent = np.full(len(problem.valid), -1, dtype=np.int64)
+    parent[problem.start] = problem.start
+    frontier = np.array([problem.start])
+    expanded = generated = 0
+
+    while len(frontier) and parent[problem.goal] == -1:
+        starts, counts = offsets[frontier], offsets[frontier + 1] - offsets[frontier]
+        # Flat index of every successor slot of every frontier state.
+        slots = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        children, parents = targets[slots], np.repeat(frontier, counts)
+        expanded += len(frontier)
+        generated += len(children)
+        fresh = parent[children] == -1
+        children, first = np.unique(children[fresh], return_index=True)
+        parent[children] = parents[fresh][first]
+        frontier = children
+
+    if parent[problem.goal] == -1:
+        return SearchResult(None, None, None, expanded, generated, time.time() - start_time)
+    states = [problem.goal]
+    while states[-1] != problem.start:
+        states.append(int(parent[states[-1]]))
+    states.reverse()
+    return SearchResult(states, [None] * (len(states) - 1), len(states) - 1,
+                        expanded, generated, time.time() - start_time)
+
+def parse_list(text):
+    return [int(item) for item in text.split(",") if item]
+
+if __name__ == "__main__":
+    engines = dict(ENGINES, table_bfs=table_bfs)
+    parser = argparse.ArgumentParser(description="Sweep Missionaries & Cannibals sizes through the search engines.")
+    parser.add_argument("--people", default="3,10,100,1000", help="comma-separated missionaries (= cannibals) counts")
+    parser.add_argument("--boat", default="2,3,4,10", help="comma-separated boat capacities")
+    parser.add_argument("--engines", default="bfs,dfs,bidirectional,table_bfs",
+                        help=f"comma-separated subset of {','.join(engines)}")
+    args = parser.parse_args()
+
+    for people in parse_list(args.people):
+        for boat in parse_list(args.boat):
+            start_time = time.time()
+            problem = MissionariesCannibals(people, boat)
+            print(f"N = {people}, B = {boat}: {int(problem.valid.sum())} safe states, "
+                  f"{len(problem.targets)} crossings, tables in {time.time() - start_time:.3f}s", flush=True)
+            for name in args.engines.split(","):
+                result = engines[name](problem)
+                outcome = f"{result.cost} crossings" if result.states else "no solution"
+                print(f"  {name}: {outcome}; {format_stats(result)}", flush=True)
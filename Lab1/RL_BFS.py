@@ -1,4 +1,7 @@
-from collections import deque
+import argparse
+# The search engines are shared with Lab2; run from the repository root as
+#   PYTHONPATH=Lab2 python Lab1/RL_BFS.py
+from Search_engine import Problem, bfs, bidirectional_bfs, format_stats
 
 def get_successors(state):
     successors = []
@@ -35,37 +38,61 @@ def get_successors(state):
 
     return successors
 
+def get_predecessors(state):
+    """The states one move before state: the rabbit that just landed next to the empty
+    stone slides or jumps back onto it (an 'E' from the right, a 'W' from the left)."""
+    predecessors = []
+    s = list(state)
 
-def solve_with_bfs(start_state, goal_state):
-    queue = deque([[start_state]])
-    visited = {start_state}
+    try:
+        empty_idx = s.index('_')
+    except ValueError:
+        return []
 
-    while queue:
-        path = queue.popleft()
-        current_state = path[-1]
+    for offset, rabbit in [(1, 'E'), (-1, 'W'), (2, 'E'), (-2, 'W')]:
+        idx = empty_idx + offset
+        if 0 <= idx < len(s) and s[idx] == rabbit:
+            new_s = s[:]
+            new_s[empty_idx], new_s[idx] = new_s[idx], new_s[empty_idx]
+            predecessors.append(tuple(new_s))
 
-        if current_state == goal_state:
-            return path
+    return predecessors
 
-        for successor in get_successors(current_state):
-            if successor not in visited:
-                visited.add(successor)
-                queue.append(path + [successor])
 
-    return None
+class RabbitLeap(Problem):
+    def __init__(self, start_state, goal_state):
+        self.start, self.goal = start_state, goal_state
 
+    def successors(self, state):
+        return [(successor, None) for successor in get_successors(state)]
 
-# --- Main ---
-initial_state = ('E', 'E', 'E', '_', 'W', 'W', 'W')
-goal_state = ('W', 'W', 'W', '_', 'E', 'E', 'E')
+    def predecessors(self, state):
+        return [(predecessor, None) for predecessor in get_predecessors(state)]
 
-solution_path = solve_with_bfs(initial_state, goal_state)
+def rabbit_leap(rabbits):
+    """Start and goal of the puzzle with the given number of rabbits on each side."""
+    return (('E',) * rabbits + ('_',) + ('W',) * rabbits,
+            ('W',) * rabbits + ('_',) + ('E',) * rabbits)
 
-if solution_path:
-    print("Optimal solution found! The sequence of steps is:\n")
-    for i, state in enumerate(solution_path):
-        print(f"Step {i:2d}: {' '.join(state)}")
-    print(f"\nThis solution is optimal and requires {len(solution_path) - 1} steps.")
-else:
 
-    print("No solution was found.")
+# --- Main ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve the rabbit leap puzzle with breadth-first search.")
+    parser.add_argument("--rabbits", type=int, default=3, help="rabbits on each side")
+    parser.add_argument("--bidirectional", action="store_true",
+                        help="search from the start and the goal at once until they meet")
+    args = parser.parse_args()
+
+    initial_state, goal_state = rabbit_leap(args.rabbits)
+    search = bidirectional_bfs if args.bidirectional else bfs
+    result = search(RabbitLeap(initial_state, goal_state))
+    solution_path = result.states
+
+    if solution_path:
+        print("Optimal solution found! The sequence of steps is:\n")
+        for i, state in enumerate(solution_path):
+            print(f"Step {i:2d}: {' '.join(state)}")
+        print(f"\nThis solution is optimal and requires {len(solution_path) - 1} steps.")
+        print(format_stats(result))
+    else:
+        print("No solution was found.")
@@ -1,3 +1,7 @@
+# The search engines are shared with Lab2; run from the repository root as
+#   PYTHONPATH=Lab2 python Lab1/RL_DFS.py
+from Search_engine import Problem, dfs, format_stats
+
 def get_successors(state):
     successors = []
     s = list(state)
@@ -28,29 +32,18 @@ def get_successors(state):
 
     return successors
 
-def solve_with_dfs(start_state, goal_state):
-    stack = [[start_state]]
-    visited = {start_state}
-
-    while stack:
-        path = stack.pop()
-        current_state = path[-1]
-
-        if current_state == goal_state:
-            return path
-
-        for successor in get_successors(current_state):
-            if successor not in visited:
-                visited.add(successor)
-                new_path = path + [successor]
-                stack.append(new_path)
+class RabbitLeap(Problem):
+    def __init__(self, start_state, goal_state):
+        self.start, self.goal = start_state, goal_state
 
-    return None
+    def successors(self, state):
+        return [(successor, None) for successor in get_successors(state)]
 
 initial_state = ('E', 'E', 'E', '_', 'W', 'W', 'W')
 goal_state = ('W', 'W', 'W', '_', 'E', 'E', 'E')
 
-solution_path = solve_with_dfs(initial_state, goal_state)
+result = dfs(RabbitLeap(initial_state, goal_state))
+solution_path = result.states
 
 if solution_path:
     print("Solution found with DFS! The sequence of steps is:\n")
@@ -58,5 +51,6 @@ if solution_path:
         print(f"Step {i:2d}: {' '.join(state)}")
     print(f"\nDFS found a solution with {len(solution_path) - 1} steps.")
     print("Note: This path is not guaranteed to be the shortest one.")
+    print(format_stats(result))
 else:
     print("No solution was found.")
\ No newline at end of file
@@ -1,18 +1,16 @@
-import heapq
+import argparse
+import os
 import time
-
-#It's impossible to solve with this on collab
-class Node:
-    def __init__(self, state, parent=None, action=None, path_cost=0):
-        self.state = state
-        self.parent = parent
-        self.action = action
-        self.path_cost = path_cost
-
-    def __lt__(self, other):
-        return self.path_cost < other.path_cost
-
-initial_state = (
+from Search_engine import format_stats, ucs
+from Solitaire_board import GOAL, format_board, from_grid
+from Solitaire_heuristics import pegs_heuristic
+from Solitaire_layers import layered_search
+from Solitaire_problem import PegSolitaire
+from Transposition_table import TranspositionTable
+
+# Positions are stored under their canonical symmetry key, so the eight symmetric
+# copies of a position are searched once.
+initial_state = from_grid((
     (-1, -1, 1, 1, 1, -1, -1),
     (-1, -1, 1, 1, 1, -1, -1),
     ( 1,  1, 1, 1, 1,  1,  1),
@@ -20,97 +18,65 @@ initial_state = (
     ( 1,  1, 1, 1, 1,  1,  1),
     (-1, -1, 1, 1, 1, -1, -1),
     (-1, -1, 1, 1, 1, -1, -1),
-)
-
-total_nodes_expanded = 0
-
-def is_goal_state(state):
-    marble_count = sum(row.count(1) for row in state)
-    return marble_count == 1 and state[3][3] == 1
-
-def get_successors(node):
-    successors = []
-    state = node.state
-    for r in range(7):
-        for c in range(7):
-            if state[r][c] == 1:
-                for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                    jumped_r, jumped_c = r + dr, c + dc
-                    to_r, to_c = r + 2 * dr, c + 2 * dc
-
-                    if 0 <= to_r < 7 and 0 <= to_c < 7 and \
-                       state[to_r][to_c] != -1 and \
-                       state[jumped_r][jumped_c] == 1 and \
-                       state[to_r][to_c] == 0:
-
-                        new_state_list = [list(row) for row in state]
-                        new_state_list[r][c] = 0
-                        new_state_list[jumped_r][jumped_c] = 0
-                        new_state_list[to_r][to_c] = 1
-                        new_state = tuple(map(tuple, new_state_list))
-
-                        child_node = Node(new_state, node, action=((r, c), (to_r, to_c)), path_cost=node.path_cost + 1)
-                        successors.append(child_node)
-    return successors
-
-def uniform_cost_search():
-    global total_nodes_expanded
-    total_nodes_expanded = 0
-
-    start_node = Node(state=initial_state, path_cost=0)
-    frontier = [(start_node.path_cost, start_node)]
-    explored = set()
-
-    while frontier:
-        priority, current_node = heapq.heappop(frontier)
-        total_nodes_expanded += 1
-
-        if is_goal_state(current_node.state):
-            return current_node
-
-        if current_node.state in explored:
-            continue
-
-        explored.add(current_node.state)
-
-        for child in get_successors(current_node):
-            if child.state not in explored:
-                heapq.heappush(frontier, (child.path_cost, child))
-
-    return None
-
-def extract_path(node):
-    actions = []
-    current = node
-    while current.parent is not None:
-        actions.append(current.action)
-        current = current.parent
-    return actions[::-1]
+))
+
+# In-memory uniform cost search over the whole board is still impractical: every generated
+# node stays in the arena and the frontier, at roughly 240 bytes each, and even with pagoda
+# pruning the canonical positions number in the millions per layer. The layered search,
+# which keeps its layers on disk, is the default and runs to the end.
+REACHED_LIMIT = 8_000_000
+
+def uniform_cost_search(reached_limit=REACHED_LIMIT):
+    # Cheapest known cost per position; a child is only queued when it improves on it.
+    # Every jump removes one peg, so only the layer being expanded and the next are looked
+    # up again, and the LRU bound drops finished layers first. Once two layers together
+    # outgrow it, evicted positions get queued and expanded again: still optimal, just
+    # repeated work. A limit of 0 keeps every entry. The heuristic only prunes
+    # pagoda-dead positions; uniform cost search orders by g alone.
+    reached = TranspositionTable(max_size=reached_limit)
+    return ucs(PegSolitaire(initial_state, GOAL, pegs_heuristic(GOAL)), reached)
 
 def print_board(state):
-    char_map = {1: 'o', 0: '.', -1: ' '}
-    for row in state:
-        print(" ".join(char_map[cell] for cell in row))
+    print(format_board(state))
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Solve English peg solitaire one peg count at a time, "
+                                                 "in parallel, with the layers kept on disk.")
+    parser.add_argument("--ucs", action="store_true",
+                        help="run in-memory uniform cost search instead; its memory grows with every node generated")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--memory-mb", type=int, default=512, help="RAM budget of the layered search")
+    parser.add_argument("--work-dir", help="where the layered search keeps its layers (default: system temp)")
+    parser.add_argument("--reached-limit", type=int, default=REACHED_LIMIT,
+                        help="LRU bound on the positions --ucs remembers (0: unbounded); the search "
+                             "still keeps every generated node, so this does not bound its memory")
+    args = parser.parse_args()
+
     print("--- Initial Board ---")
     print_board(initial_state)
-    print("\nStarting Uniform Cost Search...")
+    print("\nStarting Uniform Cost Search..." if args.ucs else "\nStarting Layered Search...")
 
     start_time = time.time()
-    result_node = uniform_cost_search()
+    if not args.ucs:
+        moves, sizes = layered_search(initial_state, GOAL, args.work_dir, args.workers, args.memory_mb)
+        final_state = GOAL
+        stats = f"{sum(sizes)} positions in {len(sizes)} layers"
+    else:
+        result = uniform_cost_search(args.reached_limit)
+        moves = result.actions
+        final_state = result.states[-1] if result.states else None
+        stats = format_stats(result)
     end_time = time.time()
 
-    if result_node:
+    if moves is not None:
         print("\n--- Solution Found! ---")
         print(f"Time Taken: {end_time - start_time:.2f} seconds")
-        print(f"Nodes Expanded: {total_nodes_expanded}")
-        print(f"Path Length: {result_node.path_cost} moves")
+        print(f"Nodes: {stats}")
+        print(f"Path Length: {len(moves)} moves")
         print("\n--- Final Board ---")
-        print_board(result_node.state)
+        print_board(final_state)
 
         print("\n--- Moves ---")
-        moves = extract_path(result_node)
         for i, move in enumerate(moves):
             print(f"Move {i+1}: Jump from {move[0]} to {move[1]}")
     else:
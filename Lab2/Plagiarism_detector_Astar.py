@@ -1,18 +1,5 @@
-import heapq
 import re
-
-# Node class to store state information
-class Node:
-    def __init__(self, state, parent=None, g=0, h=0):
-        self.state = state
-        self.parent = parent
-        self.g = g  # Cost from start
-        self.h = h  # Heuristic (estimated cost to goal)
-        self.f = g + h # Total cost
-
-    # Allows nodes to be compared in the priority queue
-    def __lt__(self, other):
-        return self.f < other.f
+import Search_engine
 
 def clean_text(text):
     """Removes punctuation and converts to lowercase."""
@@ -39,71 +26,44 @@ def levenshtein(s1, s2):
 
     return dp[m][n]
 
-def astar(doc1, doc2, gap_penalty=50):
-    """
-    Finds the optimal alignment path using A* search with an admissible heuristic.
-    """
-    start_state = (0, 0)
-    goal_state = (len(doc1), len(doc2))
+class Alignment(Search_engine.Problem):
+    """Aligning two sentence lists: state (i, j) has matched doc1[:i] with doc2[:j]."""
+
+    cost_type = "d"  # the gap penalty need not be an integer
+
+    def __init__(self, doc1, doc2, gap_penalty):
+        self.doc1, self.doc2, self.gap_penalty = doc1, doc2, gap_penalty
+        self.start = (0, 0)
+        self.goal = (len(doc1), len(doc2))
+
+    def successors(self, state):
+        i, j = state
+        if i < len(self.doc1) and j < len(self.doc2):
+            yield (i + 1, j + 1), "match"
+        if i < len(self.doc1):
+            yield (i + 1, j), "skip1"
+        if j < len(self.doc2):
+            yield (i, j + 1), "skip2"
+
+    def cost(self, state, action, next_state):
+        if action == "match":
+            i, j = state
+            return levenshtein(self.doc1[i], self.doc2[j])
+        return self.gap_penalty
 
     # --- Admissible Heuristic Function ---
-    def heuristic(state):
+    def heuristic(self, state):
         i, j = state
-        remaining_in_doc1 = len(doc1) - i
-        remaining_in_doc2 = len(doc2) - j
+        remaining_in_doc1 = len(self.doc1) - i
+        remaining_in_doc2 = len(self.doc2) - j
         # The cost of the guaranteed gaps
-        return abs(remaining_in_doc1 - remaining_in_doc2) * gap_penalty
-
-    start_node = Node(start_state, g=0, h=heuristic(start_state))
-
-    open_list = [start_node] # Priority queue
-    g_scores = {start_state: 0} # Stores the cheapest path to a state
-
-    while open_list:
-        n = heapq.heappop(open_list)
-
-        if n.state == goal_state:
-            return reconstruct_path(n)
-
-        # Generate successors
-        parent_idx1, parent_idx2 = n.state
-
-        # Successor 1: Diagonal move
-        if parent_idx1 < len(doc1) and parent_idx2 < len(doc2):
-            s_state = (parent_idx1 + 1, parent_idx2 + 1)
-            move_cost = levenshtein(doc1[parent_idx1], doc2[parent_idx2])
-            new_g = n.g + move_cost
-            if new_g < g_scores.get(s_state, float('inf')):
-                g_scores[s_state] = new_g
-                s_node = Node(s_state, n, new_g, heuristic(s_state))
-                heapq.heappush(open_list, s_node)
-
-        if parent_idx1 < len(doc1):
-            s_state = (parent_idx1 + 1, parent_idx2)
-            move_cost = gap_penalty
-            new_g = n.g + move_cost
-            if new_g < g_scores.get(s_state, float('inf')):
-                g_scores[s_state] = new_g
-                s_node = Node(s_state, n, new_g, heuristic(s_state))
-                heapq.heappush(open_list, s_node)
-
-        if parent_idx2 < len(doc2):
-            s_state = (parent_idx1, parent_idx2 + 1)
-            move_cost = gap_penalty
-            new_g = n.g + move_cost
-            if new_g < g_scores.get(s_state, float('inf')):
-                g_scores[s_state] = new_g
-                s_node = Node(s_state, n, new_g, heuristic(s_state))
-                heapq.heappush(open_list, s_node)
-
-    return None
-
-def reconstruct_path(node):
-    path = []
-    while node:
-        path.append(node.state)
-        node = node.parent
-    return path[::-1]
+        return abs(remaining_in_doc1 - remaining_in_doc2) * self.gap_penalty
+
+def astar(doc1, doc2, gap_penalty=50):
+    """
+    Finds the optimal alignment path using A* search with an admissible heuristic.
+    """
+    return Search_engine.astar(Alignment(doc1, doc2, gap_penalty)).states
 
 def analyze_plagiarism(alignment, doc1, doc2, similarity_threshold=0.8):
     similar_pairs = []
@@ -0,0 +1,43 @@
+from array import array
+
+class NodeArena:
+    """Search nodes stored as parallel arrays indexed by node id: the state, the parent's
+    id (-1 for a root), the action that led there and the path cost g. Frontiers and
+    tables hold the small int ids instead of one object per node, and paths are rebuilt
+    by following parent ids. Pass an array typecode as state_type (e.g. "Q" for bitboards)
+    to store int states unboxed; other states are kept in a plain list. cost_type works the
+    same way for g: "q" for integer costs, "d" for float ones, None for anything else."""
+
+    __slots__ = ("states", "parents", "actions", "g")
+
+    def __init__(self, state_type=None, cost_type="q"):
+        self.states = array(state_type) if state_type else []
+        self.parents = array("q")
+        self.actions = []
+        self.g = array(cost_type) if cost_type else []
+
+    def __len__(self):
+        return len(self.parents)
+
+    def add(self, state, parent=-1, action=None, g=0):
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(action)
+        self.g.append(g)
+        return len(self.parents) - 1
+
+    def path(self, node):
+        """The actions from the root to node."""
+        actions = []
+        while self.parents[node] != -1:
+            actions.append(self.actions[node])
+            node = self.parents[node]
+        return actions[::-1]
+
+    def path_states(self, node):
+        """The states from the root to node, both included."""
+        states = [self.states[node]]
+        while self.parents[node] != -1:
+            node = self.parents[node]
+            states.append(self.states[node])
+        return states[::-1]
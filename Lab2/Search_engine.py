@@ -0,0 +1,299 @@
+import heapq
+import time
+from collections import deque, namedtuple
+from Search_core import NodeArena
+
+# states and actions run from the start to the goal (both None when the search failed);
+# expanded counts states whose successors were generated, generated counts successors.
+SearchResult = namedtuple("SearchResult", "states actions cost expanded generated seconds")
+
+class Problem:
+    """What the engines need from a search problem. Subclass it, or hand the engines any
+    object with the same attributes."""
+
+    start = None
+    goal = None        # an explicit goal state; bidirectional_bfs needs one
+    state_type = None  # NodeArena typecode for int states, e.g. "Q" for bitboards
+    cost_type = "q"    # NodeArena typecode for path costs; "d" when costs can be fractional
+
+    def successors(self, state):
+        """Yields (next state, action) pairs."""
+        raise NotImplementedError
+
+    def predecessors(self, state):
+        """Yields (previous state, action) pairs, the action leading from the previous
+        state to this one. The default suits problems whose moves can be undone by a move."""
+        return self.successors(state)
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def cost(self, state, action, next_state):
+        return 1
+
+    def heuristic(self, state):
+        """A lower bound on the cost to a goal, or None when the state cannot reach one."""
+        return 0
+
+    def key(self, state):
+        """What identifies a state in the visited tables, e.g. a canonical form."""
+        return state
+
+class KeyTable:
+    """Best cost per state key; the default reached table of the best-first engines."""
+
+    def __init__(self, key):
+        self.key = key
+        self.entries = {}
+
+    def get(self, state, default=None):
+        return self.entries.get(self.key(state), default)
+
+    def add(self, state, value=True):
+        self.entries[self.key(state)] = value
+
+def format_stats(result):
+    rate = result.expanded / result.seconds if result.seconds else float("inf")
+    return (f"{result.expanded} expanded, {result.generated} generated in "
+            f"{result.seconds:.3f}s ({rate:,.0f} nodes/s)")
+
+def found(arena, node, expanded, generated, start_time):
+    return SearchResult(arena.path_states(node), arena.path(node), arena.g[node],
+                        expanded, generated, time.time() - start_time)
+
+def failed(expanded, generated, start_time):
+    return SearchResult(None, None, None, expanded, generated, time.time() - start_time)
+
+def bfs(problem):
+    """Breadth-first graph search, goal-tested on generation. Shortest in moves."""
+    start_time = time.time()
+    arena = NodeArena(problem.state_type, problem.cost_type)
+    root = arena.add(problem.start)
+    if problem.is_goal(problem.start):
+        return found(arena, root, 0, 0, start_time)
+    visited = {problem.key(problem.start)}
+    queue = deque([root])
+    expanded = generated = 0
+
+    while queue:
+        node = queue.popleft()
+        state, g = arena.states[node], arena.g[node]
+        expanded += 1
+        for child, action in problem.successors(state):
+            generated += 1
+            k = problem.key(child)
+            if k in visited:
+                continue
+            visited.add(k)
+            child_node = arena.add(child, node, action, g + problem.cost(state, action, child))
+            if problem.is_goal(child):
+                return found(arena, child_node, expanded, generated, start_time)
+            queue.append(child_node)
+    return failed(expanded, generated, start_time)
+
+def dfs(problem, depth_limit=None):
+    """Depth-first graph search; each state is expanded at most once."""
+    start_time = time.time()
+    arena = NodeArena(problem.state_type, problem.cost_type)
+    stack = [(arena.add(problem.start), 0)]
+    visited = set()
+    expanded = generated = 0
+
+    while stack:
+        node, depth = stack.pop()
+        state = arena.states[node]
+        k = problem.key(state)
+        if k in visited:
+            continue
+        visited.add(k)
+        if problem.is_goal(state):
+            return found(arena, node, expanded, generated, start_time)
+        if depth_limit is not None and depth >= depth_limit:
+            continue
+        expanded += 1
+        g = arena.g[node]
+        # Pushed in order, so the last successor is searched first like the labs' DFS.
+        children = [(child, action) for child, action in problem.successors(state)
+                    if problem.key(child) not in visited]
+        generated += len(children)
+        for child, action in children:
+            stack.append((arena.add(child, node, action, g + problem.cost(state, action, child)), depth + 1))
+    return failed(expanded, generated, start_time)
+
+def depth_first_paths(problem, bound, measure, stats):
+    """Walks every cycle-free path from the start whose measure(g, depth, state) stays
+    within bound. Returns (states, actions, cost) of the first goal reached, or the smallest
+    measure that exceeded the bound (None if nothing did) so the caller can deepen."""
+    start = problem.start
+    states, actions, costs = [start], [], [0]
+    on_path = {problem.key(start)}
+    if problem.is_goal(start):
+        return (states, actions, 0), None
+    branches = [iter(problem.successors(start))]
+    stats[0] += 1
+    next_bound = None
+
+    while branches:
+        step = next(branches[-1], None)
+        if step is None:
+            branches.pop()
+            on_path.discard(problem.key(states.pop()))
+            costs.pop()
+            if actions:
+                actions.pop()
+            continue
+        child, action = step
+        stats[1] += 1
+        k = problem.key(child)
+        if k in on_path:
+            continue
+        g = costs[-1] + problem.cost(states[-1], action, child)
+        value = measure(g, len(states), child)
+        if value is None:
+            continue
+        if value > bound:
+            next_bound = value if next_bound is None else min(next_bound, value)
+            continue
+        if problem.is_goal(child):
+            return (states + [child], actions + [action], g), None
+        states.append(child)
+        actions.append(action)
+        costs.append(g)
+        on_path.add(k)
+        branches.append(iter(problem.successors(child)))
+        stats[0] += 1
+    return None, next_bound
+
+def iterative_deepening(problem, measure, bound, max_bound):
+    start_time = time.time()
+    stats = [0, 0]  # expanded, generated
+    while bound is not None and (max_bound is None or bound <= max_bound):
+        path, bound = depth_first_paths(problem, bound, measure, stats)
+        if path:
+            states, actions, cost = path
+            return SearchResult(states, actions, cost, stats[0], stats[1], time.time() - start_time)
+    return failed(stats[0], stats[1], start_time)
+
+def iddfs(problem, max_depth=None):
+    """Depth-limited DFS with limits 0, 1, 2, ...; shortest in moves, memory linear in depth."""
+    return iterative_deepening(problem, lambda g, depth, state: depth, 0, max_depth)
+
+def ida_star(problem, max_bound=None):
+    """A* run as depth-first search with an increasing bound on g + h; memory linear in
+    depth. Optimal when the heuristic is admissible."""
+    def measure(g, depth, state):
+        h = problem.heuristic(state)
+        return None if h is None else g + h
+    return iterative_deepening(problem, measure, problem.heuristic(problem.start), max_bound)
+
+def best_first(problem, priority, reached=None):
+    """Expands the frontier node with the smallest priority(g, h); h is the problem's
+    heuristic, and a child whose heuristic is None is never queued. reached maps a
+    state to its best g through get(state, default) and add(state, g), e.g. a
+    TranspositionTable; by default a dict on problem.key."""
+    start_time = time.time()
+    reached = reached if reached is not None else KeyTable(problem.key)
+    arena = NodeArena(problem.state_type, problem.cost_type)
+    h = problem.heuristic(problem.start)
+    if h is None:
+        return failed(0, 0, start_time)
+    # Frontier entries are (priority, h, node id): equal priorities go to the smaller h.
+    frontier = [(priority(0, h), h, arena.add(problem.start))]
+    reached.add(problem.start, 0)
+    expanded = generated = 0
+
+    while frontier:
+        _, _, node = heapq.heappop(frontier)
+        state, g = arena.states[node], arena.g[node]
+        if g > reached.get(state, g):
+            continue
+        if problem.is_goal(state):
+            return found(arena, node, expanded, generated, start_time)
+        expanded += 1
+        for child, action in problem.successors(state):
+            generated += 1
+            child_g = g + problem.cost(state, action, child)
+            if child_g >= reached.get(child, float("inf")):
+                continue
+            child_h = problem.heuristic(child)
+            if child_h is None:
+                continue
+            reached.add(child, child_g)
+            heapq.heappush(frontier, (priority(child_g, child_h), child_h, arena.add(child, node, action, child_g)))
+    return failed(expanded, generated, start_time)
+
+def ucs(problem, reached=None):
+    """Uniform cost search: cheapest path, heuristic used only for pruning."""
+    return best_first(problem, lambda g, h: g, reached)
+
+def astar(problem, reached=None):
+    """A*: cheapest path when the heuristic is admissible and consistent."""
+    return best_first(problem, lambda g, h: g + h, reached)
+
+def greedy(problem, reached=None):
+    """Greedy best-first search on the heuristic alone; fast, not optimal."""
+    return best_first(problem, lambda g, h: h, reached)
+
+def bidirectional_bfs(problem):
+    """Breadth-first from problem.start and, through predecessors(), from problem.goal,
+    a whole layer at a time on the smaller side, until the two searches meet. Shortest
+    in moves; both sides keep parent ids only."""
+    start_time = time.time()
+    forward = NodeArena(problem.state_type, problem.cost_type)
+    backward = NodeArena(problem.state_type, problem.cost_type)
+    seen = ({problem.key(problem.start): forward.add(problem.start)},
+            {problem.key(problem.goal): backward.add(problem.goal)})
+    layers = ([0], [0])
+    expanded = generated = 0
+
+    meeting = seen[1].get(problem.key(problem.start))
+    if meeting is not None:
+        return joined(forward, 0, backward, meeting, 0, 0, start_time)
+
+    while layers[0] and layers[1]:
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        arena, other = (forward, backward) if side == 0 else (backward, forward)
+        expand = problem.successors if side == 0 else problem.predecessors
+        best, next_layer = None, []
+        for node in layers[side]:
+            state, g = arena.states[node], arena.g[node]
+            expanded += 1
+            for child, action in expand(state):
+                generated += 1
+                k = problem.key(child)
+                if k in seen[side]:
+                    continue
+                step = problem.cost(state, action, child) if side == 0 else problem.cost(child, action, state)
+                child_node = arena.add(child, node, action, g + step)
+                seen[side][k] = child_node
+                next_layer.append(child_node)
+                meet = seen[1 - side].get(k)
+                if meet is not None:
+                    total = arena.g[child_node] + other.g[meet]
+                    if best is None or total < best[0]:
+                        best = (total, child_node, meet)
+        if best is not None:
+            _, node, meet = best
+            if side == 0:
+                return joined(forward, node, backward, meet, expanded, generated, start_time)
+            return joined(forward, meet, backward, node, expanded, generated, start_time)
+        layers = (next_layer, layers[1]) if side == 0 else (layers[0], next_layer)
+    return failed(expanded, generated, start_time)
+
+def joined(forward, forward_node, backward, backward_node, expanded, generated, start_time):
+    # The backward arena runs from the goal, so its half of the path is read in reverse.
+    states = forward.path_states(forward_node) + backward.path_states(backward_node)[::-1][1:]
+    actions = forward.path(forward_node) + backward.path(backward_node)[::-1]
+    cost = forward.g[forward_node] + backward.g[backward_node]
+    return SearchResult(states, actions, cost, expanded, generated, time.time() - start_time)
+
+ENGINES = {
+    "bfs": bfs,
+    "dfs": dfs,
+    "iddfs": iddfs,
+    "ucs": ucs,
+    "astar": astar,
+    "greedy": greedy,
+    "idastar": ida_star,
+    "bidirectional": bidirectional_bfs,
+}
@@ -0,0 +1,87 @@
+# English (cross-shaped) peg solitaire board as a 33-bit integer: bit i is set when
+# hole HOLES[i] holds a marble. Holes are numbered row by row, so bit 16 is the centre.
+HOLES = [(r, c) for r in range(7) for c in range(7) if 2 <= r <= 4 or 2 <= c <= 4]
+INDEX = {hole: i for i, hole in enumerate(HOLES)}
+NUM_HOLES = len(HOLES)
+FULL = (1 << NUM_HOLES) - 1
+CENTRE = INDEX[(3, 3)]
+
+START = FULL & ~(1 << CENTRE)
+GOAL = 1 << CENTRE
+
+def _jumps():
+    # (marble and jumped-over bits, landing bit, the move as ((r, c), (to_r, to_c))).
+    jumps = []
+    for r, c in HOLES:
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            over, to = (r + dr, c + dc), (r + 2 * dr, c + 2 * dc)
+            if over in INDEX and to in INDEX:
+                jumps.append(((1 << INDEX[(r, c)]) | (1 << INDEX[over]), 1 << INDEX[to], ((r, c), to)))
+    return jumps
+
+JUMPS = _jumps()
+
+def successors(board):
+    """Yields (child board, move) for every legal jump."""
+    for need, to, move in JUMPS:
+        if board & need == need and not board & to:
+            yield board ^ need ^ to, move
+
+def peg_count(board):
+    return board.bit_count()
+
+def from_grid(grid, marble=1):
+    board = 0
+    for i, (r, c) in enumerate(HOLES):
+        if grid[r][c] == marble:
+            board |= 1 << i
+    return board
+
+def to_grid(board, marble=1, empty=0, invalid=2):
+    grid = [[invalid] * 7 for _ in range(7)]
+    for i, (r, c) in enumerate(HOLES):
+        grid[r][c] = marble if board >> i & 1 else empty
+    return grid
+
+def format_board(board):
+    grid = to_grid(board, 'o', '.', ' ')
+    return "\n".join(" ".join(row) for row in grid)
+
+# The eight symmetries of the square (rotations and reflections) as maps on (r, c).
+SYMMETRIES = [
+    lambda r, c: (r, c),
+    lambda r, c: (c, 6 - r),
+    lambda r, c: (6 - r, 6 - c),
+    lambda r, c: (6 - c, r),
+    lambda r, c: (r, 6 - c),
+    lambda r, c: (6 - r, c),
+    lambda r, c: (c, r),
+    lambda r, c: (6 - c, 6 - r),
+]
+
+def _byte_tables(symmetry):
+    # tables[k][b] is where byte k of a board lands when its set bits are b.
+    tables = []
+    for k in range(0, NUM_HOLES, 8):
+        table = []
+        for b in range(256):
+            image = 0
+            for bit in range(8):
+                if b >> bit & 1 and k + bit < NUM_HOLES:
+                    image |= 1 << INDEX[symmetry(*HOLES[k + bit])]
+            table.append(image)
+        tables.append(table)
+    return tables
+
+SYMMETRY_TABLES = [_byte_tables(symmetry) for symmetry in SYMMETRIES]
+
+def transform(board, tables):
+    image, shift = 0, 0
+    for table in tables:
+        image |= table[board >> shift & 255]
+        shift += 8
+    return image
+
+def canonical(board):
+    """The smallest of the board's eight symmetric images, shared by all of them."""
+    return min(transform(board, tables) for tables in SYMMETRY_TABLES)
@@ -0,0 +1,98 @@
+from Solitaire_board import GOAL, HOLES, INDEX, NUM_HOLES, peg_count
+
+# A heuristic takes a board and returns an estimate of the moves left, or None when the
+# position provably cannot reach the goal so the search can drop it. The heuristics are
+# built for one goal by pegs_heuristic(goal) and stranded_heuristic(goal). Every solution
+# removes one peg per move, so the peg difference is already exact for solvable positions;
+# the gain comes from recognising dead positions early and ordering the live ones.
+
+# A pagoda function weights the holes so that no jump increases the total weight of the
+# pegs: w(from) + w(over) >= w(to). A position weighing less than its goal is dead.
+PAGODA_GRIDS = [
+    [
+        [0, 0, -1, 0, -1, 0, 0],
+        [0, 0,  1, 1,  1, 0, 0],
+        [-1, 1, 0, 1,  0, 1, -1],
+        [0,  1, 1, 2,  1, 1,  0],
+        [-1, 1, 0, 1,  0, 1, -1],
+        [0, 0,  1, 1,  1, 0, 0],
+        [0, 0, -1, 0, -1, 0, 0],
+    ],
+]
+
+def _weight_tables(grid):
+    # tables[k][b] is the total weight of the pegs set in byte k of a board.
+    weights = [grid[r][c] for r, c in HOLES]
+    return [[sum(weights[k + bit] for bit in range(8) if b >> bit & 1 and k + bit < NUM_HOLES)
+             for b in range(256)]
+            for k in range(0, NUM_HOLES, 8)]
+
+PAGODAS = [_weight_tables(grid) for grid in PAGODA_GRIDS]
+
+def pagoda_value(board, tables):
+    value, shift = 0, 0
+    for table in tables:
+        value += table[board >> shift & 255]
+        shift += 8
+    return value
+
+def pagoda_targets(goal=GOAL):
+    """The goal's weight under each pagoda function, for is_dead()."""
+    return [pagoda_value(goal, tables) for tables in PAGODAS]
+
+PAGODA_TARGETS = pagoda_targets(GOAL)
+
+def is_dead(board, targets=PAGODA_TARGETS):
+    """True when some pagoda function shows the board can never reach the goal whose
+    pagoda_targets() are given (GOAL by default)."""
+    return any(pagoda_value(board, tables) < target
+               for tables, target in zip(PAGODAS, targets))
+
+# Bits of the holes orthogonally next to each hole.
+NEIGHBOURS = [sum(1 << INDEX[(r + dr, c + dc)]
+                  for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)] if (r + dr, c + dc) in INDEX)
+              for r, c in HOLES]
+
+# The tips and outer corners of the four arms, which can never be jumped over and are
+# only cleared by their own peg moving inwards.
+CORNERS = sum(1 << INDEX[hole] for hole in [
+    (0, 2), (0, 4), (2, 0), (4, 0), (2, 6), (4, 6), (6, 2), (6, 4),
+])
+
+def isolated_pegs(board):
+    count, rest = 0, board
+    while rest:
+        low = rest & -rest
+        if not board & NEIGHBOURS[low.bit_length() - 1]:
+            count += 1
+        rest ^= low
+    return count
+
+def pegs_heuristic(goal=GOAL):
+    """Admissible: the exact number of moves left to goal, with pagoda-dead positions and
+    positions no larger than goal but different from it pruned."""
+    targets, goal_pegs = pagoda_targets(goal), peg_count(goal)
+
+    def h_pegs(board):
+        pegs = peg_count(board)
+        if pegs <= goal_pegs:
+            return 0 if board == goal else None
+        if is_dead(board, targets):
+            return None
+        return pegs - goal_pegs
+    return h_pegs
+
+def stranded_heuristic(goal=GOAL):
+    """Moves left plus a penalty for isolated pegs, which need another peg brought next
+    to them, and pegs in the arm corners, which can only leave by jumping inwards. Not
+    admissible; it steers the search towards compact positions and prunes dead ones."""
+    targets, goal_pegs = pagoda_targets(goal), peg_count(goal)
+
+    def h_stranded(board):
+        pegs = peg_count(board)
+        if pegs <= goal_pegs:
+            return 0 if board == goal else None
+        if is_dead(board, targets):
+            return None
+        return pegs - goal_pegs + isolated_pegs(board) + peg_count(board & CORNERS)
+    return h_stranded
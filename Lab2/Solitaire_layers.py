@@ -0,0 +1,139 @@
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from Solitaire_board import GOAL, JUMPS, START, canonical, successors
+from Solitaire_heuristics import is_dead, pagoda_targets
+
+# Layer-by-layer search for peg solitaire. Every jump removes exactly one peg, so the
+# positions at depth d are exactly those with (pegs at start - d) pegs, and a layer never
+# meets a position from an earlier one. Each layer is kept on disk as sorted, duplicate-free
+# uint64 arrays of canonical boards, split into hash buckets small enough to merge in RAM.
+# Paths are rebuilt afterwards by walking back from the goal through the stored layers.
+
+BYTES_PER_CHILD = 64  # a Python int in the workers' child sets, with its hash table slot
+MERGE_COPIES = 4      # a merge holds its parts, their concatenation and np.unique's sort and output
+MIX = np.uint64(0x9E3779B97F4A7C15)
+
+def bucket_of(boards, buckets):
+    # Multiplicative hashing spreads the canonical boards, whose low bits are skewed.
+    return (np.asarray(boards, dtype=np.uint64) * MIX >> np.uint64(40)) % np.uint64(buckets)
+
+def layer_files(layer_dir):
+    return sorted(glob.glob(os.path.join(layer_dir, "bucket*.npy")))
+
+def layer_contains(layer_dir, buckets, board):
+    boards = np.load(layer_files(layer_dir)[int(bucket_of([board], buckets)[0])], mmap_mode="r")
+    i = np.searchsorted(boards, np.uint64(board))
+    return i < len(boards) and boards[i] == board
+
+def expand_chunk(path, start, stop, out_prefix, buckets, targets):
+    """Writes the canonical children of boards[start:stop] of one layer file as one
+    sorted part per bucket, dropping children that are pagoda-dead for the goal's
+    targets (None keeps them all). Returns how many distinct children the chunk produced."""
+    children = set()
+    for board in np.load(path, mmap_mode="r")[start:stop].tolist():
+        for child, _ in successors(board):
+            if not (targets and is_dead(child, targets)):
+                children.add(canonical(child))
+    children = np.array(sorted(children), dtype=np.uint64)
+    parts = bucket_of(children, buckets)
+    for b in range(buckets):
+        np.save(f"{out_prefix}.{b:04d}.npy", children[parts == b])
+    return len(children)
+
+def merge_bucket(part_paths, out_path):
+    boards = np.unique(np.concatenate([np.load(p) for p in part_paths]))
+    np.save(out_path, boards)
+    for p in part_paths:
+        os.remove(p)
+    return len(boards)
+
+def merge_buckets(pool, layer_dir, buckets, budget):
+    """Merges the parts of every bucket of a layer, starting a merge only while the
+    merges in flight, going by the size of their parts on disk, stay within budget.
+    Returns the number of positions in the layer."""
+    total, running, in_flight = 0, {}, 0
+    for b in range(buckets):
+        parts = sorted(glob.glob(os.path.join(layer_dir, f"part*.{b:04d}.npy")))
+        need = MERGE_COPIES * sum(os.path.getsize(p) for p in parts)
+        while running and in_flight + need > budget:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                total += future.result()
+                in_flight -= running.pop(future)
+        running[pool.submit(merge_bucket, parts, os.path.join(layer_dir, f"bucket{b:04d}.npy"))] = need
+        in_flight += need
+    return total + sum(future.result() for future in running)
+
+def layered_search(start=START, goal=GOAL, work_dir=None, workers=None, memory_mb=512,
+                   prune=True, verbose=True):
+    """Searches from start to goal one peg count at a time with the layers on disk.
+    memory_mb bounds what the workers hold at once, whether expanding chunks or merging
+    buckets; prune drops positions the goal's pagoda weights rule out. Positions are
+    matched up to symmetry, so the moves end in goal or one of its mirror images (the
+    same board for the centre goal). Returns (moves as ((r, c), (to_r, to_c)) or None,
+    number of positions in each layer)."""
+    with tempfile.TemporaryDirectory(dir=work_dir) as root:
+        workers = workers or os.cpu_count()
+        budget = memory_mb << 20
+        chunk = max(1000, budget // (2 * workers * BYTES_PER_CHILD * 16))
+        target = canonical(goal)
+        # The pagoda grid is symmetric, so canonical images weigh the same as the boards.
+        targets = pagoda_targets(goal) if prune else None
+
+        layers = []  # (directory, buckets) per depth
+        first = os.path.join(root, "layer00")
+        os.makedirs(first)
+        np.save(os.path.join(first, "bucket0000.npy"), np.array([canonical(start)], dtype=np.uint64))
+        layers.append((first, 1))
+        sizes = [1]
+        found = target == canonical(start)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while not found and sizes[-1]:
+                start_time = time.time()
+                layer_dir, _ = layers[-1]
+                depth = len(layers)
+                next_dir = os.path.join(root, f"layer{depth:02d}")
+                os.makedirs(next_dir)
+                # Size the buckets from the last layer's growth so one merge fits the budget.
+                growth = sizes[-1] / sizes[-2] if len(sizes) > 1 else 16
+                buckets = max(1, -(-int(sizes[-1] * max(growth, 1) * 8 * MERGE_COPIES) // budget))
+
+                futures = []
+                for path in layer_files(layer_dir):
+                    n = len(np.load(path, mmap_mode="r"))
+                    for s in range(0, n, chunk):
+                        prefix = os.path.join(next_dir, f"part{len(futures):06d}")
+                        futures.append(pool.submit(expand_chunk, path, s, min(s + chunk, n), prefix, buckets, targets))
+                for future in futures:
+                    future.result()
+
+                sizes.append(merge_buckets(pool, next_dir, buckets, budget))
+                layers.append((next_dir, buckets))
+                found = bool(sizes[-1]) and layer_contains(next_dir, buckets, target)
+                if verbose:
+                    print(f"Layer {depth}: {sizes[-1]} positions in {buckets} buckets "
+                          f"({time.time() - start_time:.1f}s)", flush=True)
+
+        if not found:
+            return None, sizes
+
+        # Walk back from the goal, undoing any jump that lands in the layer above, then
+        # replay the chain of canonical positions forwards from the real start board.
+        chain, board = [target], goal
+        for layer_dir, buckets in reversed(layers[:-1]):
+            for need, to, _ in JUMPS:
+                parent = board ^ need ^ to
+                if board & to and not board & need and layer_contains(layer_dir, buckets, canonical(parent)):
+                    chain.append(canonical(parent))
+                    board = parent
+                    break
+        moves, board = [], start
+        for key in reversed(chain[:-1]):
+            board, move = next((child, move) for child, move in successors(board) if canonical(child) == key)
+            moves.append(move)
+        return moves, sizes
@@ -0,0 +1,16 @@
+from Search_engine import Problem
+from Solitaire_board import GOAL, START, successors
+
+class PegSolitaire(Problem):
+    """The board as a search problem for the engines in Search_engine. heuristic follows
+    the Solitaire_heuristics contract and defaults to 0."""
+
+    state_type = "Q"
+
+    def __init__(self, start=START, goal=GOAL, heuristic=None):
+        self.start, self.goal = start, goal
+        if heuristic is not None:
+            self.heuristic = heuristic
+
+    def successors(self, state):
+        return successors(state)
@@ -0,0 +1,33 @@
+from collections import OrderedDict
+from Solitaire_board import canonical
+
+class TranspositionTable:
+    """Maps positions to a value (e.g. the best g seen) under their canonical symmetry key,
+    so all eight rotations/reflections of a position share one entry. With max_size the
+    table evicts the least recently used entry once full."""
+
+    def __init__(self, key=canonical, max_size=None):
+        self.key = key
+        self.max_size = max_size
+        self.entries = OrderedDict() if max_size else {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, board):
+        return self.get(board) is not None
+
+    def get(self, board, default=None):
+        k = self.key(board)
+        value = self.entries.get(k, default)
+        if self.max_size and k in self.entries:
+            self.entries.move_to_end(k)
+        return value
+
+    def add(self, board, value=True):
+        k = self.key(board)
+        self.entries[k] = value
+        if self.max_size:
+            self.entries.move_to_end(k)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
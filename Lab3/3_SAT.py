@@ -1,113 +1,144 @@
-import string
+import argparse
 import random
-import copy
-import numpy as np
+from CDCL_solver import cdcl
+from K_SAT import generate_k_sat
+from SAT_counters import ClauseCounters
+from SAT_formula import CNF, random_assignment, read_dimacs
+from SAT_local_search import SOLVERS
+from SAT_portfolio import run_portfolio
 
 def make_formula(num_clauses, num_vars):
     if 3 > num_vars:
         print(f"Error: A 3-SAT clause requires at least 3 variables (n={num_vars} is too small).")
-        return [], []
-    l_vars = list(string.ascii_lowercase[:num_vars])
-    u_vars = [v.upper() for v in l_vars]
-    all_literals = l_vars + u_vars
-    formula = []
-    for _ in range(num_clauses):
-        chosen_vars = random.sample(l_vars, 3)
-        clause = [var if random.choice([True, False]) else var.upper() for var in chosen_vars]
-        formula.append(sorted(clause))
-    return formula, all_literals
+        return None
+    return CNF.from_clauses(generate_k_sat(3, num_vars, num_clauses), num_vars)
 
-def make_assignment(literals, num_vars):
-    l_assign = list(np.random.choice(2, num_vars))
-    u_assign = [1 - val for val in l_assign]
-    return dict(zip(literals, l_assign + u_assign))
+def make_assignment(num_vars):
+    return random_assignment(num_vars)
 
 def eval_formula(formula, assignment):
-    return sum(any(assignment[literal] for literal in clause) for clause in formula)
+    return formula.count_satisfied(assignment)
 
-def hill_climbing(formula, assignment, prev_score, found_step, total_steps):
-    best_assignment = assignment.copy()
-    max_score = prev_score
-    best_neighbor_assignment = assignment.copy()
-    for literal in list(assignment.keys()):
-        if not literal.islower():
-            continue
-        total_steps += 1
-        temp_assignment = assignment.copy()
-        temp_assignment[literal] = 1 - temp_assignment[literal]
-        temp_assignment[literal.upper()] = 1 - temp_assignment[literal.upper()]
-        score = eval_formula(formula, temp_assignment)
-        if score > max_score:
-            max_score = score
-            best_neighbor_assignment = temp_assignment.copy()
-            found_step = total_steps
-    if max_score == prev_score:
-        return best_assignment, max_score, f"{found_step}/{total_steps}"
-    return hill_climbing(formula, best_neighbor_assignment, max_score, found_step, total_steps)
+def make_counters(formula, assignment):
+    return ClauseCounters(formula.clauses(), assignment, formula.num_vars)
 
-def beam_search(formula, assignment, beam_width, steps):
-    if eval_formula(formula, assignment) == len(formula):
-        return assignment, f"{steps}/{steps}"
-    candidates = []
-    for literal in list(assignment.keys()):
-        if not literal.islower():
-            continue
-        steps += 1
-        new_assignment = assignment.copy()
-        new_assignment[literal] = 1 - new_assignment[literal]
-        new_assignment[literal.upper()] = 1 - new_assignment[literal.upper()]
-        score = eval_formula(formula, new_assignment)
-        candidates.append((new_assignment, score, steps))
-    best_in_beam = sorted(candidates, key=lambda x: x[1])[-beam_width:]
-    for state, score, step_count in best_in_beam:
-        if score == len(formula):
-            return state, f"{step_count}/{steps}"
-    best_next_state = best_in_beam[-1][0]
-    return beam_search(formula, best_next_state, beam_width, steps)
+def hill_climbing(counters, found_step, total_steps):
+    while True:
+        best_var, best_gain = None, 0
+        for var in range(1, counters.num_vars + 1):
+            total_steps += 1
+            gain = counters.score(var)
+            if gain > best_gain:
+                best_var, best_gain = var, gain
+                found_step = total_steps
+        if best_var is None:
+            return counters, counters.satisfied, f"{found_step}/{total_steps}"
+        counters.flip(best_var)
 
-def variable_neighborhood_search(formula, assignment, neighborhood_size, steps):
-        if eval_formula(formula, assignment) == len(formula):
-            return assignment, f"{steps}/{steps}", neighborhood_size
+def beam_search(counters, beam_width, steps, max_rounds=1000):
+    # Without a solution the walk can cycle forever, so it gives up after max_rounds moves.
+    num_clauses = len(counters.clauses)
+    for _ in range(max_rounds):
+        if counters.satisfied == num_clauses:
+            return counters, f"{steps}/{steps}"
         candidates = []
-        for literal in list(assignment.keys()):
-            if not literal.islower():
-                continue
+        for var in range(1, counters.num_vars + 1):
             steps += 1
-            new_assignment = assignment.copy()
-            new_assignment[literal] = 1 - new_assignment[literal]
-            new_assignment[literal.upper()] = 1 - new_assignment[literal.upper()]
-            score = eval_formula(formula, new_assignment)
-            candidates.append((new_assignment, score, steps))
-        best_neighbors = sorted(candidates, key=lambda x: x[1])[-neighborhood_size:]
-        for state, score, step_count in best_neighbors:
-            if score == len(formula):
-                return state, f"{step_count}/{steps}", neighborhood_size
-        best_next_state = best_neighbors[-1][0]
-        return variable_neighborhood_search(formula, best_next_state, neighborhood_size + 1, steps)
+            candidates.append((var, counters.satisfied + counters.score(var), steps))
+        best_in_beam = sorted(candidates, key=lambda x: x[1])[-beam_width:]
+        for var, score, step_count in best_in_beam:
+            if score == num_clauses:
+                counters.flip(var)
+                return counters, f"{step_count}/{steps}"
+        counters.flip(best_in_beam[-1][0])
+    return counters, f"{steps}/{steps}"
+
+def variable_neighborhood_search(counters, neighborhood_size, steps, max_rounds=1000):
+        num_clauses = len(counters.clauses)
+        for _ in range(max_rounds):
+            if counters.satisfied == num_clauses:
+                return counters, f"{steps}/{steps}", neighborhood_size
+            candidates = []
+            for var in range(1, counters.num_vars + 1):
+                steps += 1
+                candidates.append((var, counters.satisfied + counters.score(var), steps))
+            best_neighbors = sorted(candidates, key=lambda x: x[1])[-neighborhood_size:]
+            for var, score, step_count in best_neighbors:
+                if score == num_clauses:
+                    counters.flip(var)
+                    return counters, f"{step_count}/{steps}", neighborhood_size
+            counters.flip(best_neighbors[-1][0])
+            neighborhood_size += 1
+        return counters, f"{steps}/{steps}", neighborhood_size
 
 def run_solvers():
     try:
         num_clauses = int(input("Enter the number of clauses (m): "))
         num_vars = int(input("Enter the number of variables (n): "))
         print("-" * 30)
-        formula, literals = make_formula(num_clauses, num_vars)
-        if not formula:
+        formula = make_formula(num_clauses, num_vars)
+        if formula is None:
             return
         print(f"Generated a 3-SAT problem with {num_vars} variables and {num_clauses} clauses.")
-        initial_assignment = make_assignment(literals, num_vars)
+        initial_assignment = make_assignment(num_vars)
         initial_score = eval_formula(formula, initial_assignment)
         print(f"Initial Random Assignment Score: {initial_score}/{len(formula)}")
         print("-" * 30)
-        _, hc_score, hc_penetrance = hill_climbing(formula, initial_assignment.copy(), initial_score, 1, 1)
+        _, hc_score, hc_penetrance = hill_climbing(make_counters(formula, initial_assignment), 1, 1)
         print(f"Hill-Climbing:\n  - Final Score: {hc_score}\n  - Penetrance (steps to best / total steps): {hc_penetrance}")
-        bs_assignment, bs_penetrance = beam_search(formula, initial_assignment.copy(), 3, 1)
-        bs_score = eval_formula(formula, bs_assignment)
+        bs_counters, bs_penetrance = beam_search(make_counters(formula, initial_assignment), 3, 1)
+        bs_score = bs_counters.satisfied
         print(f"\nBeam Search (w=3):\n  - Final Score: {bs_score}\n  - Penetrance: {bs_penetrance}")
-        vnd_assignment, vnd_penetrance, final_n = variable_neighborhood_search(formula, initial_assignment.copy(), 1, 1)
-        vnd_score = eval_formula(formula, vnd_assignment)
+        vnd_counters, vnd_penetrance, final_n = variable_neighborhood_search(make_counters(formula, initial_assignment), 1, 1)
+        vnd_score = vnd_counters.satisfied
         print(f"\nVariable Neighborhood Search:\n  - Final Score: {vnd_score}\n  - Penetrance: {vnd_penetrance}\n  - Final Neighborhood Size: {final_n}")
+        best_values = initial_assignment
+        for name, solver in SOLVERS.items():
+            result = solver(formula, max_flips=100 * num_vars, values=initial_assignment)
+            if result.solved:
+                best_values = result.values
+            print(f"\n{name}:\n  - Final Score: {num_clauses - result.unsat}\n  - Penetrance (flips to best / total flips): {result.best_flip}/{result.flips}\n  - Tries: {result.tries}")
+        # The complete solver settles whether the formula is satisfiable at all; it starts
+        # from the local-search solution's phases when one was found.
+        cdcl_result = cdcl(formula, phases=best_values)
+        print(f"\nCDCL:\n  - Result: {cdcl_result.status}\n  - Conflicts: {cdcl_result.conflicts}\n  - Decisions: {cdcl_result.decisions}")
     except (ValueError, IndexError):
         print("Invalid input. Please enter valid integers. Ensure n >= 3.")
 
+def run_portfolio_mode(args):
+    if args.cnf:
+        formula = read_dimacs(args.cnf)
+    else:
+        random.seed(args.seed)
+        formula = make_formula(args.clauses, args.vars)
+        if formula is None:
+            return
+    print(f"Portfolio on {formula.num_vars} variables and {formula.num_clauses} clauses "
+          f"({args.solvers}, {args.seeds} seeds each)")
+    winner, runs, wall_time = run_portfolio(formula, args.solvers.split(','), args.seeds, args.workers,
+                                            args.max_flips, args.max_tries, args.seed)
+    if winner is None:
+        print(f"No solver settled the formula ({len(runs)} runs, {wall_time:.2f}s)")
+    elif winner.unsat_proved:
+        print(f"UNSAT, proved by cdcl after {winner.flips} conflicts in {winner.seconds:.2f}s (wall {wall_time:.2f}s)")
+    else:
+        unit = "conflicts" if winner.solver == "cdcl" else "flips"
+        print(f"SAT, solved by {winner.solver} (seed {winner.seed}) after {winner.flips} {unit} "
+              f"in {winner.seconds:.2f}s (wall {wall_time:.2f}s)")
+
 if __name__ == "__main__":
-    run_solvers()
+    parser = argparse.ArgumentParser(description="Random 3-SAT solvers. Without arguments the sizes are asked for interactively.")
+    parser.add_argument("-m", "--clauses", type=int)
+    parser.add_argument("-n", "--vars", type=int)
+    parser.add_argument("--cnf", help="solve a DIMACS file instead of a random formula")
+    parser.add_argument("--solvers", default="walksat,probsat,cdcl", help=f"comma-separated subset of {','.join(SOLVERS)},cdcl")
+    parser.add_argument("--seeds", type=int, default=4, help="seeded runs per local-search solver")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-flips", type=int, default=100000)
+    parser.add_argument("--max-tries", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.cnf or (args.clauses and args.vars):
+        run_portfolio_mode(args)
+    else:
+        run_solvers()
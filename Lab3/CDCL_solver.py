@@ -0,0 +1,263 @@
+import heapq
+from collections import namedtuple
+import numpy as np
+
+# status is "SAT", "UNSAT" or "UNKNOWN" (conflict budget exhausted); values is the model
+# as a uint8 array (slot 0 unused) when SAT.
+CDCLResult = namedtuple("CDCLResult", "status values conflicts decisions propagations")
+
+def luby(i):
+    """i-th term (from 1) of 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+class CDCLSolver:
+    """Conflict-driven clause learning with two watched literals, VSIDS branching,
+    phase saving, Luby restarts and LBD-based deletion of learned clauses.
+
+    Internally literal 2*v is variable v and 2*v + 1 its negation, so l ^ 1 negates l.
+    value[l] is 1 (true), 0 (false) or -1 (unassigned). Clause c is watched through its
+    first two literals: watches[l] lists the clauses watching l, visited when l turns false.
+    """
+
+    def __init__(self, formula, restart_base=100, var_decay=0.95, phases=None):
+        n = formula.num_vars
+        self.num_vars = n
+        self.value = [-1] * (2 * n + 2)
+        self.level = [0] * (n + 1)
+        self.reason = [-1] * (n + 1)
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.clauses = []
+        self.lbd = []
+        self.learnts = []
+        self.watches = [[] for _ in range(2 * n + 2)]
+        self.activity = [0.0] * (n + 1)
+        self.var_inc = 1.0
+        self.var_decay = var_decay
+        self.heap = [(0.0, v) for v in range(1, n + 1)]
+        # Saved phases start from a given assignment (e.g. local search's best) or all false.
+        self.phase = [0] * (n + 1) if phases is None else [int(p) for p in phases[:n + 1]]
+        self.seen = [False] * (n + 1)
+        self.restart_base = restart_base
+        self.conflicts = self.decisions = self.propagations = 0
+        self.ok = True
+
+        for clause in formula.clauses():
+            literals = list(dict.fromkeys(2 * abs(l) + (l < 0) for l in clause))
+            if any(l ^ 1 in literals for l in literals):
+                continue  # tautology
+            literals = [l for l in literals if self.value[l] != 0]
+            if any(self.value[l] == 1 for l in literals):
+                continue
+            if not literals:
+                self.ok = False
+            elif len(literals) == 1:
+                self.enqueue(literals[0], -1)
+                self.ok = self.ok and self.propagate() is None
+            else:
+                self.add_clause(literals, learnt=False)
+
+    def add_clause(self, literals, learnt, lbd=0):
+        c = len(self.clauses)
+        self.clauses.append(literals)
+        self.lbd.append(lbd)
+        self.watches[literals[0]].append(c)
+        self.watches[literals[1]].append(c)
+        if learnt:
+            self.learnts.append(c)
+        return c
+
+    def decision_level(self):
+        return len(self.trail_lim)
+
+    def enqueue(self, literal, reason):
+        var = literal >> 1
+        self.value[literal] = 1
+        self.value[literal ^ 1] = 0
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """Unit propagation over the trail; returns a conflicting clause index or None."""
+        value, clauses, watches = self.value, self.clauses, self.watches
+        while self.qhead < len(self.trail):
+            false_lit = self.trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            watching = watches[false_lit]
+            keep = []
+            for i, c in enumerate(watching):
+                clause = clauses[c]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                if value[first] == 1:
+                    keep.append(c)
+                    continue
+                for k in range(2, len(clause)):
+                    if value[clause[k]] != 0:
+                        # Found a new literal to watch; the clause leaves this watch list.
+                        clause[1], clause[k] = clause[k], clause[1]
+                        watches[clause[1]].append(c)
+                        break
+                else:
+                    keep.append(c)
+                    if value[first] == 0:
+                        keep.extend(watching[i+1:])
+                        watches[false_lit] = keep
+                        self.qhead = len(self.trail)
+                        return c
+                    self.enqueue(first, c)
+            watches[false_lit] = keep
+        return None
+
+    def bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.rebuild_heap()
+        heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def rebuild_heap(self):
+        self.heap = [(-self.activity[v], v) for v in range(1, self.num_vars + 1) if self.value[2 * v] == -1]
+        heapq.heapify(self.heap)
+
+    def analyze(self, confl):
+        """First-UIP learning; returns (learnt clause, backjump level, LBD)."""
+        seen, level, trail = self.seen, self.level, self.trail
+        current = self.decision_level()
+        learnt = [0]
+        counter = 0
+        p = None
+        index = len(trail) - 1
+        while True:
+            clause = self.clauses[confl]
+            for q in (clause if p is None else clause[1:]):
+                var = q >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    self.bump(var)
+                    if level[var] == current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            p = trail[index]
+            index -= 1
+            confl = self.reason[p >> 1]
+            seen[p >> 1] = False
+            counter -= 1
+            if counter == 0:
+                break
+        learnt[0] = p ^ 1
+
+        # Drop literals implied by the rest of the clause (local minimisation).
+        minimised = [learnt[0]]
+        for q in learnt[1:]:
+            reason = self.reason[q >> 1]
+            if reason == -1 or not all(seen[r >> 1] or level[r >> 1] == 0 for r in self.clauses[reason][1:]):
+                minimised.append(q)
+        for q in learnt:
+            seen[q >> 1] = False
+        learnt = minimised
+
+        if len(learnt) == 1:
+            return learnt, 0, 1
+        # The second watch must be the literal from the highest remaining level.
+        k = max(range(1, len(learnt)), key=lambda t: level[learnt[t] >> 1])
+        learnt[1], learnt[k] = learnt[k], learnt[1]
+        lbd = len({level[q >> 1] for q in learnt})
+        return learnt, level[learnt[1] >> 1], lbd
+
+    def cancel_until(self, target):
+        if self.decision_level() <= target:
+            return
+        for literal in self.trail[self.trail_lim[target]:]:
+            var = literal >> 1
+            self.phase[var] = 1 - (literal & 1)
+            self.value[literal] = self.value[literal ^ 1] = -1
+            self.reason[var] = -1
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[self.trail_lim[target]:]
+        del self.trail_lim[target:]
+        self.qhead = len(self.trail)
+        if len(self.heap) > 4 * self.num_vars + 1000:
+            self.rebuild_heap()
+
+    def pick_branch(self):
+        while self.heap:
+            activity, var = heapq.heappop(self.heap)
+            if self.value[2 * var] == -1 and -activity == self.activity[var]:
+                return 2 * var + (1 - self.phase[var])
+        return None
+
+    def reduce_db(self):
+        """Deletes the worse half of the learned clauses by LBD, keeping glue clauses and reasons."""
+        locked = {self.reason[self.clauses[c][0] >> 1] for c in self.learnts
+                  if self.value[self.clauses[c][0]] == 1}
+        candidates = sorted((c for c in self.learnts if self.lbd[c] > 2 and c not in locked),
+                            key=lambda c: (self.lbd[c], len(self.clauses[c])), reverse=True)
+        removed = set(candidates[:len(candidates) // 2])
+        for c in removed:
+            self.clauses[c] = None
+        self.learnts = [c for c in self.learnts if c not in removed]
+        self.watches = [[c for c in watching if c not in removed] for watching in self.watches]
+
+    def solve(self, max_conflicts=None, stop=None):
+        if not self.ok or self.propagate() is not None:
+            return "UNSAT"
+        max_learnts = len(self.clauses) / 3 + 100
+        restarts = 1
+        restart_at = self.conflicts + self.restart_base * luby(restarts)
+        while True:
+            confl = self.propagate()
+            if confl is not None:
+                self.conflicts += 1
+                if self.decision_level() == 0:
+                    return "UNSAT"
+                learnt, backjump, lbd = self.analyze(confl)
+                self.cancel_until(backjump)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], -1)
+                else:
+                    self.enqueue(learnt[0], self.add_clause(learnt, learnt=True, lbd=lbd))
+                self.var_inc /= self.var_decay
+                if max_conflicts is not None and self.conflicts >= max_conflicts:
+                    return "UNKNOWN"
+                if stop is not None and stop.is_set():
+                    return "UNKNOWN"
+                if self.conflicts >= restart_at:
+                    restarts += 1
+                    restart_at = self.conflicts + self.restart_base * luby(restarts)
+                    self.cancel_until(0)
+            else:
+                if len(self.learnts) - len(self.trail) >= max_learnts:
+                    self.reduce_db()
+                    max_learnts *= 1.1
+                literal = self.pick_branch()
+                if literal is None:
+                    return "SAT"
+                self.decisions += 1
+                self.trail_lim.append(len(self.trail))
+                self.enqueue(literal, -1)
+
+    def model(self):
+        return np.array([0] + [self.value[2 * v] == 1 for v in range(1, self.num_vars + 1)], dtype=np.uint8)
+
+def cdcl(formula, max_conflicts=None, phases=None, stop=None):
+    solver = CDCLSolver(formula, phases=phases)
+    status = solver.solve(max_conflicts, stop)
+    values = solver.model() if status == "SAT" else None
+    return CDCLResult(status, values, solver.conflicts, solver.decisions, solver.propagations)
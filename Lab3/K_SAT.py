@@ -1,6 +1,6 @@
 import random
 
-def generate_k_sat(k, n, m):
+def generate_k_sat(k, n, m, rng=random):
     if k > n:
         print(f"Error: k ({k}) cannot be greater than n ({n}).")
         return []
@@ -9,11 +9,11 @@ def generate_k_sat(k, n, m):
     all_variables = list(range(1, n + 1))
 
     for _ in range(m):
-        clause_variables = random.sample(all_variables, k)
+        clause_variables = rng.sample(all_variables, k)
 
         new_clause = []
         for var in clause_variables:
-            if random.choice([True, False]):
+            if rng.choice([True, False]):
                 new_clause.append(var)
             else:
                 new_clause.append(-var)
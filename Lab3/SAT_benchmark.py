@@ -0,0 +1,142 @@
+import argparse
+import csv
+import glob
+import os
+import random
+import re
+import statistics
+import threading
+import time
+from CDCL_solver import cdcl
+from K_SAT import generate_k_sat
+from SAT_formula import CNF, read_dimacs, write_dimacs
+from SAT_local_search import SOLVERS, SATResult
+
+# k3_n200_r4.26_s0_007.cnf: instance 7 of random 3-SAT with 200 variables and
+# m = round(4.26 * 200), generated with suite seed 0.
+INSTANCE_NAME = re.compile(r"k(\d+)_n(\d+)_r([\d.]+)_s(-?\d+)_(\d+)\.cnf$")
+
+CSV_FIELDS = ["solver", "k", "n", "ratio", "instances", "runs", "success_rate",
+              "median_flips", "tts_seconds", "penetrance"]
+
+def instance_path(out_dir, k, n, ratio, seed, index):
+    return os.path.join(out_dir, f"k{k}_n{n}_r{ratio:g}_s{seed}_{index:03d}.cnf")
+
+def generate_suite(out_dir, ks, ns, ratios, count, seed=0):
+    """Writes count instances per (k, n, ratio) as DIMACS, one at a time. Every instance
+    has its own RNG seeded from (seed, k, n, ratio, index), so any file can be rebuilt alone
+    and files that already exist are left alone."""
+    if max(ks) > min(ns):
+        raise ValueError(f"Clause width k = {max(ks)} exceeds n = {min(ns)} variables.")
+    os.makedirs(out_dir, exist_ok=True)
+    written = 0
+    for k in ks:
+        for n in ns:
+            for ratio in ratios:
+                for index in range(count):
+                    path = instance_path(out_dir, k, n, ratio, seed, index)
+                    if os.path.exists(path):
+                        continue
+                    rng = random.Random(f"{seed}-{k}-{n}-{ratio:g}-{index}")
+                    formula = CNF.from_clauses(generate_k_sat(k, n, round(ratio * n), rng), n)
+                    write_dimacs(path, formula, [f"random {k}-SAT, n = {n}, m/n = {ratio:g}, seed = {seed}"])
+                    written += 1
+    return written
+
+def run_cdcl(formula, max_flips=100000, max_tries=10, seed=None, values=None, stop=None):
+    # CDCL in the local-search interface: flips are conflicts, so max_flips caps the
+    # conflicts, and an UNSAT proof is not a success.
+    result = cdcl(formula, max_conflicts=max_flips, stop=stop)
+    return SATResult(result.status == "SAT", result.values, 0 if result.status == "SAT" else None,
+                     result.conflicts, result.conflicts, 1)
+
+def benchmark_solvers():
+    return dict(SOLVERS, cdcl=run_cdcl)
+
+def run_harness(suite_dir, solvers, runs=3, max_flips=100000, max_tries=10, time_budget=None, seed=0):
+    """Runs every solver `runs` times per instance and aggregates per (solver, k, n, ratio).
+    A time budget is enforced through the solvers' stop event. Returns CSV rows."""
+    registry = benchmark_solvers()
+    groups = {}
+    for path in sorted(glob.glob(os.path.join(suite_dir, "*.cnf"))):
+        match = INSTANCE_NAME.search(os.path.basename(path))
+        if match:
+            k, n, ratio, _, _ = match.groups()
+            groups.setdefault((int(k), int(n), float(ratio)), []).append(path)
+
+    rows = []
+    for (k, n, ratio), paths in sorted(groups.items()):
+        formulas = [read_dimacs(path) for path in paths]
+        for name in solvers:
+            solved_flips, penetrance, seconds, successes = [], [], 0.0, 0
+            for formula in formulas:
+                for r in range(runs):
+                    stop = threading.Event()
+                    timer = threading.Timer(time_budget, stop.set) if time_budget else None
+                    if timer:
+                        timer.start()
+                    start_time = time.time()
+                    result = registry[name](formula, max_flips, max_tries, seed=seed + r, stop=stop)
+                    seconds += time.time() - start_time
+                    if timer:
+                        timer.cancel()
+                    penetrance.append(result.best_flip / result.flips if result.flips else 1.0)
+                    if result.solved:
+                        successes += 1
+                        solved_flips.append(result.flips)
+            total = len(formulas) * runs
+            rows.append({
+                "solver": name, "k": k, "n": n, "ratio": f"{ratio:g}",
+                "instances": len(formulas), "runs": total,
+                "success_rate": f"{successes / total:.3f}",
+                "median_flips": statistics.median(solved_flips) if solved_flips else "",
+                # Expected time to a solution when failed runs are simply repeated.
+                "tts_seconds": f"{seconds / successes:.4f}" if successes else "",
+                "penetrance": f"{statistics.mean(penetrance):.3f}",
+            })
+            print(", ".join(f"{field} = {rows[-1][field]}" for field in CSV_FIELDS), flush=True)
+    return rows
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def parse_list(text, kind):
+    return [kind(value) for value in text.split(',')]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Random k-SAT benchmark suite and solver sweep.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a seeded suite of DIMACS instances")
+    generate.add_argument("out_dir")
+    generate.add_argument("--k", default="3", help="comma-separated clause widths")
+    generate.add_argument("--n", default="100,200", help="comma-separated variable counts")
+    generate.add_argument("--ratios", default="3.5,4.0,4.26", help="comma-separated clause/variable ratios")
+    generate.add_argument("--count", type=int, default=10, help="instances per (k, n, ratio)")
+    generate.add_argument("--seed", type=int, default=0)
+
+    run = commands.add_parser("run", help="run the solvers over a suite and write a CSV")
+    run.add_argument("suite_dir")
+    run.add_argument("--solvers", default=",".join(SOLVERS), help=f"comma-separated subset of {','.join(benchmark_solvers())}")
+    run.add_argument("--runs", type=int, default=3, help="seeded runs per instance")
+    run.add_argument("--max-flips", type=int, default=100000)
+    run.add_argument("--max-tries", type=int, default=10)
+    run.add_argument("--time-budget", type=float, default=None, help="seconds per run")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--csv", default="sat_benchmark.csv")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        if max(parse_list(args.k, int)) > min(parse_list(args.n, int)):
+            generate.error("every clause width --k must be at most every variable count --n")
+        written = generate_suite(args.out_dir, parse_list(args.k, int), parse_list(args.n, int),
+                                 parse_list(args.ratios, float), args.count, args.seed)
+        print(f"Wrote {written} new instances to {args.out_dir}")
+    else:
+        rows = run_harness(args.suite_dir, args.solvers.split(','), args.runs, args.max_flips,
+                           args.max_tries, args.time_budget, args.seed)
+        write_csv(args.csv, rows)
+        print(f"Results written to {args.csv}")
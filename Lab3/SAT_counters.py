@@ -0,0 +1,95 @@
+class ClauseCounters:
+    """Incremental bookkeeping for local search over a CNF formula.
+
+    Clauses are lists of DIMACS literals (v or -v, variables numbered from 1) and
+    values[v] is 0 or 1. For every clause we keep the number of true literals and the
+    sum of the variables behind them, so when exactly one literal is true the sum *is*
+    that critical variable. From these make[v] (unsatisfied clauses a flip of v would
+    satisfy) and brk[v] (satisfied clauses it would break) stay exact, and flip() only
+    touches the clauses v occurs in.
+    """
+
+    def __init__(self, clauses, values, num_vars=None):
+        # A repeated literal would be counted twice in true_sum, so duplicates are dropped.
+        self.clauses = [list(dict.fromkeys(clause)) for clause in clauses]
+        if num_vars is None:
+            num_vars = max((abs(l) for clause in self.clauses for l in clause), default=0)
+        self.num_vars = num_vars
+        self.values = [0] * (self.num_vars + 1)
+        # occurrences[l] for literal l lives at index l (negative literals wrap to the end).
+        self.occurrences = [[] for _ in range(2 * self.num_vars + 1)]
+        for c, clause in enumerate(self.clauses):
+            for literal in clause:
+                self.occurrences[literal].append(c)
+        self.reset(values)
+
+    def reset(self, values):
+        """Loads a new assignment and rebuilds every counter in O(total literals)."""
+        # values may be a uint8 array; plain ints keep flip() cheap.
+        self.values[1:] = [int(v) for v in values[1:self.num_vars + 1]]
+        m = len(self.clauses)
+        self.true_count = [0] * m
+        self.true_sum = [0] * m
+        self.make = [0] * (self.num_vars + 1)
+        self.brk = [0] * (self.num_vars + 1)
+        self.unsat = []
+        self.unsat_index = [-1] * m
+        for c, clause in enumerate(self.clauses):
+            for literal in clause:
+                if self.is_true(literal):
+                    self.true_count[c] += 1
+                    self.true_sum[c] += abs(literal)
+            if self.true_count[c] == 0:
+                self._add_unsat(c)
+                for literal in clause:
+                    self.make[abs(literal)] += 1
+            elif self.true_count[c] == 1:
+                self.brk[self.true_sum[c]] += 1
+
+    def is_true(self, literal):
+        return self.values[literal] == 1 if literal > 0 else self.values[-literal] == 0
+
+    def _add_unsat(self, c):
+        self.unsat_index[c] = len(self.unsat)
+        self.unsat.append(c)
+
+    def _remove_unsat(self, c):
+        # Swap with the last entry so removal is O(1).
+        i = self.unsat_index[c]
+        last = self.unsat.pop()
+        if last != c:
+            self.unsat[i] = last
+            self.unsat_index[last] = i
+        self.unsat_index[c] = -1
+
+    @property
+    def satisfied(self):
+        return len(self.clauses) - len(self.unsat)
+
+    def score(self, var):
+        """Change in the number of satisfied clauses if var were flipped."""
+        return self.make[var] - self.brk[var]
+
+    def flip(self, var):
+        self.values[var] ^= 1
+        now_true = var if self.values[var] else -var
+        for c in self.occurrences[now_true]:
+            self.true_count[c] += 1
+            if self.true_count[c] == 1:
+                self._remove_unsat(c)
+                for literal in self.clauses[c]:
+                    self.make[abs(literal)] -= 1
+                self.brk[var] += 1
+            elif self.true_count[c] == 2:
+                self.brk[self.true_sum[c]] -= 1
+            self.true_sum[c] += var
+        for c in self.occurrences[-now_true]:
+            self.true_count[c] -= 1
+            self.true_sum[c] -= var
+            if self.true_count[c] == 0:
+                self._add_unsat(c)
+                for literal in self.clauses[c]:
+                    self.make[abs(literal)] += 1
+                self.brk[var] -= 1
+            elif self.true_count[c] == 1:
+                self.brk[self.true_sum[c]] += 1
@@ -0,0 +1,96 @@
+import numpy as np
+
+class CNF:
+    """A CNF formula stored flat: clause c is literals[offsets[c]:offsets[c+1]].
+
+    Literals are DIMACS integers (v or -v, variables numbered from 1). Assignments are
+    uint8 arrays of length num_vars + 1 with slot 0 unused, so values[v] is variable v.
+    """
+
+    def __init__(self, literals, offsets, num_vars):
+        self.literals = np.asarray(literals, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.num_vars = num_vars
+
+    @classmethod
+    def from_clauses(cls, clauses, num_vars=None):
+        lengths = [len(clause) for clause in clauses]
+        offsets = np.zeros(len(clauses) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        literals = np.fromiter((l for clause in clauses for l in clause), dtype=np.int32, count=int(offsets[-1]))
+        if num_vars is None:
+            num_vars = int(np.abs(literals).max()) if len(literals) else 0
+        return cls(literals, offsets, num_vars)
+
+    @property
+    def num_clauses(self):
+        return len(self.offsets) - 1
+
+    def __len__(self):
+        return self.num_clauses
+
+    def clauses(self):
+        flat = self.literals.tolist()
+        bounds = self.offsets.tolist()
+        return [flat[bounds[c]:bounds[c+1]] for c in range(self.num_clauses)]
+
+    def satisfied_matrix(self, values):
+        """values is a (P, num_vars + 1) batch of assignments (or a single one); returns a
+        (P, num_clauses) boolean matrix saying which clause each assignment satisfies."""
+        values = np.atleast_2d(np.asarray(values, dtype=np.uint8))
+        # Gather every literal's variable for every assignment, then OR within each clause.
+        true = values[:, np.abs(self.literals)] ^ (self.literals < 0)
+        lengths = np.diff(self.offsets)
+        satisfied = np.zeros((len(values), self.num_clauses), dtype=bool)
+        # Empty clauses are never satisfied and would confuse reduceat, so skip their starts.
+        nonempty = lengths > 0
+        if nonempty.any():
+            satisfied[:, nonempty] = np.logical_or.reduceat(true, self.offsets[:-1][nonempty], axis=1)
+        return satisfied
+
+    def count_satisfied_batch(self, values):
+        return np.count_nonzero(self.satisfied_matrix(values), axis=1)
+
+    def count_satisfied(self, values):
+        return int(self.count_satisfied_batch(values)[0])
+
+def random_assignment(num_vars, rng=None):
+    rng = rng or np.random
+    values = np.zeros(num_vars + 1, dtype=np.uint8)
+    values[1:] = rng.randint(0, 2, size=num_vars)
+    return values
+
+def read_dimacs(path):
+    num_vars, num_clauses, clauses, clause = None, None, [], []
+    with open(path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            # SATLIB files end with a "%" line followed by a stray "0".
+            if line.startswith("%"):
+                break
+            if not line or line[0] == "c":
+                continue
+            if line[0] == "p":
+                _, _, num_vars, num_clauses = line.split()
+                num_vars, num_clauses = int(num_vars), int(num_clauses)
+                continue
+            for token in line.split():
+                literal = int(token)
+                if literal == 0:
+                    # An empty clause past the declared count is trailing junk, not a clause.
+                    if clause or num_clauses is None or len(clauses) < num_clauses:
+                        clauses.append(clause)
+                    clause = []
+                else:
+                    clause.append(literal)
+    if clause:
+        clauses.append(clause)
+    return CNF.from_clauses(clauses, num_vars)
+
+def write_dimacs(path, formula, comments=()):
+    with open(path, 'w') as file:
+        for comment in comments:
+            file.write(f"c {comment}\n")
+        file.write(f"p cnf {formula.num_vars} {formula.num_clauses}\n")
+        for clause in formula.clauses():
+            file.write(" ".join(map(str, clause)) + " 0\n")
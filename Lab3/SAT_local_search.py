@@ -0,0 +1,136 @@
+import random
+from collections import namedtuple
+import numpy as np
+from SAT_counters import ClauseCounters
+
+# flips counts every flip over all tries; best_flip is the flip at which the fewest
+# clauses were unsatisfied (the solution itself when solved).
+SATResult = namedtuple("SATResult", "solved values unsat flips best_flip tries")
+
+# How many flips pass between checks of the stop event.
+STOP_POLL = 1024
+
+def random_values(num_vars, rng):
+    return [0] + [rng.getrandbits(1) for _ in range(num_vars)]
+
+def run_local_search(formula, pick, max_flips=100000, max_tries=10, seed=None, values=None, stop=None):
+    """Flips pick(counters, rng) until nothing is unsatisfied, restarting from a fresh
+    random assignment every max_flips flips, for at most max_tries tries. A set stop
+    event (polled every STOP_POLL flips) ends the search early."""
+    rng = random.Random(seed)
+    n = formula.num_vars
+    counters = ClauseCounters(formula.clauses(), random_values(n, rng) if values is None else values, n)
+    flips = best_flip = 0
+    best_unsat = len(counters.unsat)
+    best_values = counters.values[:]
+
+    for tries in range(1, max_tries + 1):
+        if tries > 1:
+            counters.reset(random_values(n, rng))
+        for _ in range(max_flips):
+            if not counters.unsat:
+                break
+            if stop is not None and flips % STOP_POLL == 0 and stop.is_set():
+                break
+            counters.flip(pick(counters, rng))
+            flips += 1
+            if len(counters.unsat) < best_unsat:
+                best_unsat = len(counters.unsat)
+                best_flip = flips
+                best_values = counters.values[:]
+        if not counters.unsat or (stop is not None and stop.is_set()):
+            break
+    return SATResult(best_unsat == 0, np.array(best_values, dtype=np.uint8), best_unsat, flips, best_flip, tries)
+
+def walksat_pick(counters, rng, noise):
+    # SKC WalkSAT: take a zero-break variable of a random unsatisfied clause if there is one,
+    # otherwise a random variable with probability noise and a least-break one otherwise.
+    clause = counters.clauses[rng.choice(counters.unsat)]
+    brk = counters.brk
+    least = min(brk[abs(l)] for l in clause)
+    if least > 0 and rng.random() < noise:
+        return abs(rng.choice(clause))
+    return abs(rng.choice([l for l in clause if brk[abs(l)] == least]))
+
+def gsat_pick(counters, rng, noise):
+    # GSAT with random walk: the best make - break over all variables, ties broken at
+    # random; with probability noise a variable of a random unsatisfied clause instead.
+    if noise and rng.random() < noise:
+        return abs(rng.choice(counters.clauses[rng.choice(counters.unsat)]))
+    make, brk = counters.make, counters.brk
+    best, candidates = None, []
+    for var in range(1, counters.num_vars + 1):
+        score = make[var] - brk[var]
+        if best is None or score > best:
+            best, candidates = score, [var]
+        elif score == best:
+            candidates.append(var)
+    return rng.choice(candidates)
+
+def probsat_pick(counters, rng, cb, eps):
+    # probSAT (polynomial, break-only): P(var) proportional to (eps + break)^-cb.
+    clause = counters.clauses[rng.choice(counters.unsat)]
+    brk = counters.brk
+    weights = [(eps + brk[abs(l)]) ** -cb for l in clause]
+    return abs(rng.choices(clause, weights)[0])
+
+def walksat(formula, max_flips=100000, max_tries=10, seed=None, values=None, stop=None, noise=0.5):
+    return run_local_search(formula, lambda counters, rng: walksat_pick(counters, rng, noise),
+                            max_flips, max_tries, seed, values, stop)
+
+def gsat(formula, max_flips=100000, max_tries=10, seed=None, values=None, stop=None, noise=0.0):
+    return run_local_search(formula, lambda counters, rng: gsat_pick(counters, rng, noise),
+                            max_flips, max_tries, seed, values, stop)
+
+def probsat(formula, max_flips=100000, max_tries=10, seed=None, values=None, stop=None, cb=2.38, eps=1.0):
+    # cb = 2.38 is the published setting for random 3-SAT.
+    return run_local_search(formula, lambda counters, rng: probsat_pick(counters, rng, cb, eps),
+                            max_flips, max_tries, seed, values, stop)
+
+def beam(formula, max_flips=100000, max_tries=10, seed=None, values=None, stop=None, width=16, branch=8):
+    """Population beam search scored with CNF.count_satisfied_batch: each round every one
+    of the width states flips `branch` variables taken from random unsatisfied clauses and
+    the best width of the width * branch children survive. max_flips bounds the number of
+    children scored; max_tries is unused since the beam never restarts."""
+    rng = np.random.default_rng(seed)
+    n = formula.num_vars
+    lengths = np.diff(formula.offsets)
+    population = rng.integers(0, 2, size=(width, n + 1), dtype=np.uint8)
+    population[:, 0] = 0
+    if values is not None:
+        population[0] = values
+    satisfied = formula.satisfied_matrix(population)
+    scores = satisfied.sum(axis=1)
+    best = int(np.argmax(scores))
+    best_values, best_unsat = population[best].copy(), formula.num_clauses - int(scores[best])
+    flips = best_flip = 0
+
+    while best_unsat and flips < max_flips and not (stop is not None and stop.is_set()):
+        # Random keys with satisfied clauses pushed to the back pick distinct unsatisfied
+        # clauses per state (satisfied ones only when fewer than branch are left).
+        keys = rng.random(satisfied.shape) + satisfied
+        clauses = np.argsort(keys, axis=1)[:, :branch]
+        picks = formula.offsets[clauses] + (rng.random(clauses.shape) * lengths[clauses]).astype(np.int64)
+        variables = np.abs(formula.literals[picks])
+        children = np.repeat(population, clauses.shape[1], axis=0)
+        children[np.arange(len(children)), variables.ravel()] ^= 1
+        flips += len(children)
+
+        # Identical children would soon fill the whole beam with one state.
+        children = children[np.sort(np.unique(children, axis=0, return_index=True)[1])]
+        satisfied = formula.satisfied_matrix(children)
+        scores = satisfied.sum(axis=1)
+        keep = np.argsort(-scores, kind="stable")[:width]
+        population, satisfied, scores = children[keep], satisfied[keep], scores[keep]
+        if formula.num_clauses - int(scores[0]) < best_unsat:
+            best_unsat = formula.num_clauses - int(scores[0])
+            best_values = population[0].copy()
+            best_flip = flips
+    return SATResult(best_unsat == 0, best_values, best_unsat, flips, best_flip, 1)
+
+SOLVERS = {
+    "walksat": walksat,
+    "gsat": gsat,
+    "probsat": probsat,
+    "beam": beam,
+}
@@ -0,0 +1,56 @@
+import multiprocessing
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from CDCL_solver import cdcl
+from SAT_local_search import SOLVERS
+
+# One finished run. For CDCL "flips" is the number of conflicts and solved is only True
+# for SAT; unsat_proved marks the one way a run can settle the formula without a model.
+PortfolioRun = namedtuple("PortfolioRun", "solver seed solved unsat_proved values flips seconds")
+
+_stop = None
+
+def init_worker(stop):
+    global _stop
+    _stop = stop
+
+def portfolio_run(formula, solver, seed, max_flips, max_tries):
+    start_time = time.time()
+    if solver == "cdcl":
+        result = cdcl(formula, stop=_stop)
+        run = PortfolioRun(solver, seed, result.status == "SAT", result.status == "UNSAT",
+                           result.values, result.conflicts, time.time() - start_time)
+    else:
+        result = SOLVERS[solver](formula, max_flips, max_tries, seed=seed, stop=_stop)
+        run = PortfolioRun(solver, seed, result.solved, False, result.values, result.flips,
+                           time.time() - start_time)
+    if run.solved or run.unsat_proved:
+        _stop.set()
+    return run
+
+def run_portfolio(formula, solvers=("walksat", "probsat", "cdcl"), seeds=4, workers=None,
+                  max_flips=100000, max_tries=10, seed=0):
+    """Runs every local-search solver with `seeds` seeds (and CDCL once) in a process pool.
+    The first run to settle the formula sets a shared event that stops all the others.
+    Returns (winning run or None, every finished run, wall time)."""
+    # Round-robin over seeds so that with fewer workers than jobs every solver (CDCL
+    # included) still gets a run early on.
+    jobs = [(solver, None if solver == "cdcl" else seed + s)
+            for s in range(seeds) for solver in solvers if s == 0 or solver != "cdcl"]
+    stop = multiprocessing.Event()
+    winner, runs = None, []
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=workers or min(len(jobs), multiprocessing.cpu_count()),
+                             initializer=init_worker, initargs=(stop,)) as pool:
+        futures = [pool.submit(portfolio_run, formula, solver, s, max_flips, max_tries) for solver, s in jobs]
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            run = future.result()
+            runs.append(run)
+            if winner is None and (run.solved or run.unsat_proved):
+                winner = run
+                for pending in futures:
+                    pending.cancel()
+    return winner, runs, time.time() - start_time
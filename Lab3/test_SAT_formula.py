@@ -0,0 +1,26 @@
+from SAT_formula import read_dimacs
+
+# The layout of the SATLIB uf*/uuf* benchmarks, including their "%" / "0" trailer.
+SATLIB_FILE = """c This Formular is generated by mcnf
+c
+c    horn? no
+c
+p cnf 3 2
+ 1 -2 0
+ 2 3 0
+%
+0
+
+"""
+
+def test_read_dimacs_stops_at_satlib_trailer(tmp_path):
+    path = tmp_path / "uf3-02.cnf"
+    path.write_text(SATLIB_FILE)
+    formula = read_dimacs(str(path))
+    assert formula.num_vars == 3
+    assert formula.clauses() == [[1, -2], [2, 3]]
+
+def test_read_dimacs_ignores_empty_clauses_past_header_count(tmp_path):
+    path = tmp_path / "extra.cnf"
+    path.write_text("p cnf 2 1\n1 2 0\n0\n")
+    assert read_dimacs(str(path)).clauses() == [[1, 2]]
@@ -0,0 +1,67 @@
+import math
+import os
+import pickle
+import random
+from collections import namedtuple
+import numpy as np
+
+# What the annealers hand to a progress callback every report_every iterations.
+Progress = namedtuple("Progress", "iteration temperature current_cost best_cost acceptance_rate")
+
+# The default checkpoint interval spreads this many checkpoints over the cooling schedule,
+# or falls back to a fixed interval for a run that neither cools nor has an iteration cap.
+CHECKPOINTS_PER_RUN = 20
+UNBOUNDED_CHECKPOINT_EVERY = 100000
+
+def print_progress(progress, label=""):
+    print(f"{label}iter {progress.iteration}: T = {progress.temperature:.4g}, "
+          f"cost = {progress.current_cost:.2f}, best = {progress.best_cost:.2f}, "
+          f"accepted = {100 * progress.acceptance_rate:.1f}%", flush=True)
+
+def schedule_length(temperature, cooling_rate, stopping_temp):
+    """Iterations a geometric schedule takes to cool from temperature to stopping_temp,
+    or None when cooling_rate >= 1 and it never gets there."""
+    if temperature <= stopping_temp:
+        return 0
+    if cooling_rate >= 1:
+        return None
+    return math.ceil(math.log(stopping_temp / temperature) / math.log(cooling_rate))
+
+def checkpoint_interval(temperature, cooling_rate, stopping_temp, maxiter=None):
+    """The default checkpoint_every: a twentieth of the run, which ends at the end of
+    the cooling schedule or at maxiter, whichever comes first."""
+    iterations = schedule_length(temperature, cooling_rate, stopping_temp)
+    if maxiter is not None:
+        iterations = maxiter if iterations is None else min(iterations, maxiter)
+    if iterations is None:
+        return UNBOUNDED_CHECKPOINT_EVERY
+    return max(1, iterations // CHECKPOINTS_PER_RUN)
+
+def save_checkpoint(path, state, params):
+    """Pickles the annealer state together with both RNG states and the parameters of the
+    run that made it; the file is replaced atomically."""
+    state = dict(state, params=params, random_state=random.getstate(), numpy_state=np.random.get_state())
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        pickle.dump(state, file)
+    os.replace(tmp_path, path)
+
+def load_checkpoint(path, params):
+    """Returns the saved state and restores the RNGs, or None when there is nothing to resume.
+    A checkpoint saved with other run parameters is refused rather than resumed."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        state = pickle.load(file)
+    saved = state.pop("params", None)
+    if saved != params:
+        raise ValueError(f"Checkpoint {path} belongs to another run ({saved}, not {params}); "
+                         f"remove it or pick another path.")
+    random.setstate(state.pop("random_state"))
+    np.random.set_state(state.pop("numpy_state"))
+    return state
+
+def remove_checkpoint(path):
+    """Deletes the checkpoint of a run that has finished, so the path can be reused."""
+    if path and os.path.exists(path):
+        os.remove(path)
@@ -1,90 +1,418 @@
+import argparse
 import random
 import math
+import os
 import numpy as np
 import scipy.io
 import sys
+from Anneal_checkpoint import (Progress, checkpoint_interval, load_checkpoint, print_progress,
+                               remove_checkpoint, save_checkpoint)
 
+# Default grid; the image shape always comes from the .mat variable.
 BLOCKS_PER_SIDE = 15
-BLOCK_SIZE = 225 // BLOCKS_PER_SIDE
+# Right, down, left, up as (row, column) steps on the block grid.
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
 
-def cost_function(puzzle):
+def as_image(puzzle):
+    image = np.asarray(puzzle, dtype=np.int64)
+    if image.ndim == 1:
+        side = math.isqrt(image.size)
+        image = image.reshape(side, side)
+    return image
+
+def cost_function(puzzle, blocks=BLOCKS_PER_SIDE):
+    image = as_image(puzzle)
+    height, width = image.shape
+    grid = image.reshape(blocks, height // blocks, blocks, width // blocks)
+    # grid[block_row, pixel_row, block_col, pixel_col]; seams sit between neighbouring blocks.
+    cost = np.abs(grid[:, :, :-1, -1] - grid[:, :, 1:, 0]).sum()
+    cost += np.abs(grid[:-1, -1, :, :] - grid[1:, 0, :, :]).sum()
+    return int(cost)
+
+def split_tiles(puzzle, blocks=BLOCKS_PER_SIDE):
+    image = as_image(puzzle)
+    height, width = image.shape
+    if height % blocks or width % blocks:
+        raise ValueError(f"A {height}x{width} image cannot be cut into a {blocks}x{blocks} grid.")
+    tiles = image.reshape(blocks, height // blocks, blocks, width // blocks).swapaxes(1, 2)
+    return tiles.reshape(blocks * blocks, height // blocks, width // blocks)
+
+def edge_tables(tiles):
+    # tables[d][a][b] is the seam cost of tile b sitting one step in DIRECTIONS[d] from tile a.
+    right = np.abs(tiles[:, None, :, -1] - tiles[None, :, :, 0]).sum(axis=2)
+    down = np.abs(tiles[:, None, -1, :] - tiles[None, :, 0, :]).sum(axis=2)
+    return [right.tolist(), down.tolist(), right.T.tolist(), down.T.tolist()]
+
+def compatibility_tables(tiles):
+    # Like edge_tables(), but each side's boundary is extrapolated one pixel across the seam
+    # from its last two rows/columns and compared with the other side. Much more
+    # discriminative than the raw seam difference, so it is used to seed placements.
+    t = tiles.astype(np.int64)
+    ahead, behind = 2 * t[:, :, -1] - t[:, :, -2], 2 * t[:, :, 0] - t[:, :, 1]
+    right = (np.abs(ahead[:, None, :] - t[None, :, :, 0]).sum(axis=2)
+             + np.abs(behind[None, :, :] - t[:, None, :, -1]).sum(axis=2))
+    ahead, behind = 2 * t[:, -1, :] - t[:, -2, :], 2 * t[:, 0, :] - t[:, 1, :]
+    down = (np.abs(ahead[:, None, :] - t[None, :, 0, :]).sum(axis=2)
+            + np.abs(behind[None, :, :] - t[:, None, -1, :]).sum(axis=2))
+    return [right.tolist(), down.tolist(), right.T.tolist(), down.T.tolist()]
+
+def swap_delta(placement, tables, p, q):
+    """Cost change from swapping the tiles at grid positions p and q; only their seams move."""
+    blocks = math.isqrt(len(placement))
+    a, b = placement[p], placement[q]
+    before = after = 0
+    for pos, old, new in ((p, a, b), (q, b, a)):
+        r, c = divmod(pos, blocks)
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            nr, nc = r + dr, c + dc
+            if not (0 <= nr < blocks and 0 <= nc < blocks):
+                continue
+            other = nr * blocks + nc
+            if other == p or other == q:
+                if pos == p:
+                    before += tables[d][a][b]
+                    after += tables[d][b][a]
+                continue
+            before += tables[d][old][placement[other]]
+            after += tables[d][new][placement[other]]
+    return after - before
+
+def grid_neighbours(blocks=BLOCKS_PER_SIDE):
+    # grid_neighbours()[pos][d] is the position one step in DIRECTIONS[d] from pos, or -1.
+    neighbours = np.full((blocks * blocks, 4), -1)
+    for pos in range(blocks * blocks):
+        r, c = divmod(pos, blocks)
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            if 0 <= r + dr < blocks and 0 <= c + dc < blocks:
+                neighbours[pos, d] = (r + dr) * blocks + c + dc
+    return neighbours
+
+def batch_swap_delta(placement, table_array, pairs, neighbours=None):
+    """swap_delta() for K candidate swaps at once; pairs is a (K, 2) array of grid positions."""
+    if neighbours is None:
+        neighbours = grid_neighbours(math.isqrt(len(placement)))
+    placement = np.asarray(placement)
+    pairs = np.asarray(pairs)
+    p, q = pairs[:, 0], pairs[:, 1]
+    a, b = placement[p], placement[q]
+    d = np.arange(4)
+    delta = np.zeros(len(pairs), dtype=np.int64)
+    for pos, other, old, new, shared in ((p, q, a, b, True), (q, p, b, a, False)):
+        nb = neighbours[pos]
+        valid = nb >= 0
+        is_other = nb == other[:, None]
+        before_tiles = placement[np.where(valid, nb, 0)]
+        after_tiles = np.where(is_other, old[:, None], before_tiles)
+        if not shared:
+            # The seam between p and q was already counted from p's side.
+            valid &= ~is_other
+        change = table_array[d, new[:, None], after_tiles] - table_array[d, old[:, None], before_tiles]
+        delta += np.where(valid, change, 0).sum(axis=1)
+    return delta
+
+def placement_cost(placement, tables):
+    blocks = math.isqrt(len(placement))
+    right, down = tables[0], tables[1]
     cost = 0
-    for i in range(225):
-        for j in range(225):
-            if j + 1 != 225 and (j + 1) % BLOCK_SIZE == 0:
-                cost += abs(int(puzzle[225*i + j]) - int(puzzle[225*i + j + 1]))
-            if i + 1 != 225 and (i + 1) % BLOCK_SIZE == 0:
-                cost += abs(int(puzzle[225*i + j]) - int(puzzle[225*(i+1) + j]))
+    for pos, tile in enumerate(placement):
+        r, c = divmod(pos, blocks)
+        if c + 1 < blocks:
+            cost += right[tile][placement[pos + 1]]
+        if r + 1 < blocks:
+            cost += down[tile][placement[pos + blocks]]
     return cost
 
-def swap_pieces(puzzle):
-    i, j = random.sample(range(BLOCKS_PER_SIDE**2), 2)
-    r1, r2 = i // BLOCKS_PER_SIDE, j // BLOCKS_PER_SIDE
-    c1, c2 = i % BLOCKS_PER_SIDE, j % BLOCKS_PER_SIDE
-    rn1, rn2 = BLOCK_SIZE * r1, BLOCK_SIZE * r2
-    cn1, cn2 = BLOCK_SIZE * c1, BLOCK_SIZE * c2
-    piece1 = []
-    piece2 = []
-    for x in range(BLOCK_SIZE):
-        for y in range(BLOCK_SIZE):
-            piece1.append(puzzle[225*(rn1 + x) + (cn1 + y)])
-            piece2.append(puzzle[225*(rn2 + x) + (cn2 + y)])
-    for x in range(BLOCK_SIZE):
-        for y in range(BLOCK_SIZE):
-            puzzle[225*(rn1 + x) + (cn1 + y)] = piece2[x*BLOCK_SIZE + y]
-            puzzle[225*(rn2 + x) + (cn2 + y)] = piece1[x*BLOCK_SIZE + y]
-    return puzzle
-
-def simulated_annealing(puzzle, T_initial, alpha, stopping_temp):
-    T = T_initial
-    current_state = puzzle
-    current_cost = cost_function(current_state)
-
-    minState = current_state.copy()
-    minCost = current_cost
+def assemble(tiles, placement):
+    blocks = math.isqrt(len(placement))
+    _, tile_height, tile_width = tiles.shape
+    grid = tiles[placement].reshape(blocks, blocks, tile_height, tile_width)
+    return grid.swapaxes(1, 2).reshape(blocks * tile_height, blocks * tile_width)
+
+def swap_pieces(placement, i=None, j=None):
+    if i is None:
+        i, j = random.sample(range(len(placement)), 2)
+    placement[i], placement[j] = placement[j], placement[i]
+    return placement
+
+def merge_boxes(box, other):
+    return (min(box[0], other[0]), max(box[1], other[1]), min(box[2], other[2]), max(box[3], other[3]))
+
+def fits(box, blocks):
+    # box is (top, bottom, left, right) in whatever coordinates the caller grows in.
+    return box[1] - box[0] < blocks and box[3] - box[2] < blocks
+
+def grow_placement(tables, cells):
+    """Fills the blocks x blocks frame outwards from the tiles already in cells.
+
+    Every step takes the empty cell next to the placed region whose best unplaced tile
+    stands out most from the runner-up, judged by the summed seam cost against the
+    placed neighbours. cells maps (row, col) to a tile and may use any offset; the
+    result is shifted into a placement list.
+    """
+    table_array = np.array(tables)
+    n = len(tables[0])
+    blocks = math.isqrt(n)
+    cells = dict(cells)
+    unplaced = np.ones(n, dtype=bool)
+    unplaced[list(cells.values())] = False
+    rows = [r for r, _ in cells]
+    cols = [c for _, c in cells]
+    box = (min(rows), max(rows), min(cols), max(cols))
+    frontier = {(r + dr, c + dc) for (r, c) in cells for dr, dc in DIRECTIONS} - set(cells)
+
+    while unplaced.any():
+        candidates = unplaced.nonzero()[0]
+        best = None
+        for slot in frontier:
+            if not fits(merge_boxes(box, (slot[0], slot[0], slot[1], slot[1])), blocks):
+                continue
+            cost = np.zeros(len(candidates))
+            count = 0
+            for d, (dr, dc) in enumerate(DIRECTIONS):
+                neighbour = cells.get((slot[0] + dr, slot[1] + dc))
+                if neighbour is not None:
+                    # The neighbour sees the candidate in the opposite direction.
+                    cost += table_array[(d + 2) % 4][neighbour, candidates]
+                    count += 1
+            order = np.argsort(cost)
+            runner_up = cost[order[1]] if len(order) > 1 else cost[order[0]] + count
+            score = (cost[order[0]] + 1) / (runner_up + 1)
+            if best is None or score < best[0]:
+                best = (score, slot, int(candidates[order[0]]))
+        _, slot, tile = best
+        cells[slot] = tile
+        unplaced[tile] = False
+        box = merge_boxes(box, (slot[0], slot[0], slot[1], slot[1]))
+        frontier.discard(slot)
+        frontier.update((slot[0] + dr, slot[1] + dc) for dr, dc in DIRECTIONS
+                        if (slot[0] + dr, slot[1] + dc) not in cells)
+
+    placement = [0] * n
+    for (r, c), tile in cells.items():
+        placement[(r - box[0]) * blocks + (c - box[2])] = tile
+    return placement
 
+def greedy_placement(tables):
+    # Seed with the single cheapest right-hand seam and grow from there.
+    right = np.array(tables[0])
+    np.fill_diagonal(right, np.iinfo(np.int64).max)
+    a, b = np.unravel_index(np.argmin(right), right.shape)
+    return grow_placement(tables, {(0, 0): int(a), (0, 1): int(b)})
+
+def mst_placement(tables, candidates=5):
+    """Kruskal-style assembly: join rigid clusters along the most confident seams first.
+
+    A seam's confidence is its cost over the cheapest competing seam for either tile, so
+    distinctive matches are merged before ambiguous ones; only pairs where one tile is
+    among the other's best few candidates are considered. Two clusters are only merged
+    if they do not overlap and still fit in the frame; the largest cluster is then
+    completed with grow_placement().
+    """
+    n = len(tables[0])
+    blocks = math.isqrt(n)
+    edges = []
+    for d in (0, 1):
+        table = np.array(tables[d], dtype=float)
+        np.fill_diagonal(table, np.inf)
+        first = np.sort(table, axis=1)[:, :2]
+        first_col = np.sort(table, axis=0)[:2, :]
+        # Cheapest alternative for a (any other b) and for b (any other a).
+        alt_a = np.where(table == first[:, :1], first[:, 1:2], first[:, :1])
+        alt_b = np.where(table == first_col[:1, :], first_col[1:2, :], first_col[:1, :])
+        confidence = (table + 1) / (np.minimum(alt_a, alt_b) + 1)
+        rank_a = np.argsort(np.argsort(table, axis=1), axis=1)
+        rank_b = np.argsort(np.argsort(table, axis=0), axis=0)
+        keep = ((rank_a < candidates) | (rank_b < candidates)) & np.isfinite(table)
+        for a, b in np.argwhere(keep):
+            edges.append((confidence[a, b], d, int(a), int(b)))
+    edges.sort()
+
+    cluster_of = list(range(n))
+    clusters = {t: {(0, 0): t} for t in range(n)}
+    boxes = {t: (0, 0, 0, 0) for t in range(n)}
+    position = [(0, 0)] * n
+    for _, d, a, b in edges:
+        ca, cb = cluster_of[a], cluster_of[b]
+        if ca == cb:
+            continue
+        if len(clusters[ca]) < len(clusters[cb]):
+            # Always move the smaller cluster; b is then placed one step backwards from a.
+            ca, cb, a, b, sign = cb, ca, b, a, -1
+        else:
+            sign = 1
+        dr, dc = DIRECTIONS[d]
+        shift_r = position[a][0] + sign * dr - position[b][0]
+        shift_c = position[a][1] + sign * dc - position[b][1]
+        top, bottom, left, right = boxes[cb]
+        box = merge_boxes(boxes[ca], (top + shift_r, bottom + shift_r, left + shift_c, right + shift_c))
+        if not fits(box, blocks):
+            continue
+        target = clusters[ca]
+        if any((r + shift_r, c + shift_c) in target for (r, c) in clusters[cb]):
+            continue
+        for (r, c), t in clusters.pop(cb).items():
+            target[(r + shift_r, c + shift_c)] = t
+            cluster_of[t] = ca
+            position[t] = (r + shift_r, c + shift_c)
+        boxes[ca] = box
+        del boxes[cb]
+        if len(target) == n:
+            break
+
+    return grow_placement(tables, max(clusters.values(), key=len))
+
+def simulated_annealing(tables, T_initial, alpha, stopping_temp, placement=None, batch=1,
+                        progress=None, report_every=100000, checkpoint=None, checkpoint_every=None, run_info=None):
+    # The state is placement[pos] = index of the tile at grid position pos; pixels are
+    # only put back together by assemble(). With batch > 1 every step scores that many
+    # random swaps in one call and proposes the best of them.
+    n = len(tables[0])
+    if batch > 1:
+        table_array = np.array(tables)
+        neighbours = grid_neighbours(math.isqrt(n))
+
+    # run_info identifies the run (e.g. the image) to a checkpoint along with the schedule.
+    params = dict(run_info or {}, n=n, T_initial=T_initial, alpha=alpha, stopping_temp=stopping_temp,
+                  batch=batch, placement=None if placement is None else tuple(placement))
+    if checkpoint and not checkpoint_every:
+        checkpoint_every = checkpoint_interval(T_initial, alpha, stopping_temp)
+    state = load_checkpoint(checkpoint, params)
+    if state:
+        current_state, current_cost = state["placement"], state["cost"]
+        minState, minCost = state["best_placement"], state["best_cost"]
+        T, iteration = state["temperature"], state["iteration"]
+    else:
+        T = T_initial
+        current_state = list(range(n)) if placement is None else placement[:]
+        current_cost = placement_cost(current_state, tables)
+        minState = current_state.copy()
+        minCost = current_cost
+        iteration = 0
+
+    def snapshot():
+        return {"placement": current_state, "cost": current_cost, "best_placement": minState,
+                "best_cost": minCost, "temperature": T, "iteration": iteration}
+
+    accepted = 0
     while T > stopping_temp:
-        new_state = swap_pieces(current_state.copy())
-        new_cost = cost_function(new_state)
+        if batch > 1:
+            pairs = np.random.randint(n, size=(batch, 2))
+            pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+            if not len(pairs):
+                continue
+            deltas = batch_swap_delta(current_state, table_array, pairs, neighbours)
+            k = int(np.argmin(deltas))
+            (i, j), delta = pairs[k].tolist(), int(deltas[k])
+        else:
+            i, j = random.sample(range(n), 2)
+            delta = swap_delta(current_state, tables, i, j)
 
-        if new_cost < current_cost or random.random() < math.exp((current_cost - new_cost) / T):
-            current_state = new_state
-            current_cost = new_cost
+        if delta < 0 or random.random() < math.exp(-delta / T):
+            swap_pieces(current_state, i, j)
+            current_cost += delta
+            accepted += 1
 
-        if current_cost < minCost:
-            minCost = current_cost
-            minState = current_state.copy()
+            if current_cost < minCost:
+                minCost = current_cost
+                minState = current_state.copy()
 
         T *= alpha
+        iteration += 1
+        if progress and iteration % report_every == 0:
+            progress(Progress(iteration, T, current_cost, minCost, accepted / report_every))
+            accepted = 0
+        if checkpoint and iteration % checkpoint_every == 0:
+            save_checkpoint(checkpoint, snapshot(), params)
+    if checkpoint:
+        save_checkpoint(checkpoint, snapshot(), params)
 
     return minState, minCost
 
-print("Loading .mat file...")
-data = scipy.io.loadmat('/content/output.mat')
+def greedy_stage(tiles, tables, placement, params):
+    return greedy_placement(compatibility_tables(tiles))
+
+def mst_stage(tiles, tables, placement, params):
+    return mst_placement(compatibility_tables(tiles))
+
+def anneal_stage(tiles, tables, placement, params):
+    return simulated_annealing(tables, params["T_initial"], params["alpha"], params["stopping_temp"],
+                               placement=placement, batch=params["batch"], progress=params.get("progress"),
+                               report_every=params.get("report_every") or 100000,
+                               checkpoint=params.get("checkpoint"), checkpoint_every=params.get("checkpoint_every"),
+                               run_info=params.get("run_info"))[0]
+
+# Each stage maps (tiles, seam tables, placement or None, params) to a new placement.
+SOLVER_STAGES = {
+    "greedy": greedy_stage,
+    "mst": mst_stage,
+    "anneal": anneal_stage,
+}
+
+def solve(tiles, tables, stages, params):
+    placement = None
+    for stage in stages:
+        placement = SOLVER_STAGES[stage](tiles, tables, placement, params)
+        print(f"  {stage}: cost {placement_cost(placement, tables)}")
+    return placement
+
+def find_image_variable(data):
+    for key in data:
+        if not key.startswith('__') and np.ndim(data[key]) == 2 and np.size(data[key]) > 1:
+            return key
+    return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reassemble a scrambled jigsaw image.")
+    parser.add_argument("mat_file", nargs="?", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "output.mat"))
+    parser.add_argument("--blocks", type=int, default=None,
+                        help="tiles per side; defaults to a 'blocks_per_side' variable in the .mat file, else 15")
+    parser.add_argument("--stages", default="mst,anneal", help=f"comma-separated subset of {','.join(SOLVER_STAGES)}")
+    parser.add_argument("--t-initial", type=float, default=None, help="defaults to 1000, or 50 when refining a seeded placement")
+    parser.add_argument("--alpha", type=float, default=0.999995)
+    parser.add_argument("--stopping-temp", type=float, default=0.1)
+    parser.add_argument("--batch", type=int, default=1, help="candidate swaps scored per step (best-of-K acceptance when > 1)")
+    parser.add_argument("--progress-every", type=int, help="print annealing progress every N steps")
+    parser.add_argument("--checkpoint", help="save annealing state to this file and resume from it if present")
+    parser.add_argument("--checkpoint-every", type=int,
+                        help="steps between checkpoints; defaults to a twentieth of the schedule")
+    args = parser.parse_args()
 
-mat_variable_name = None
-for key in data:
-    if not key.startswith('__'):
-        mat_variable_name = key
-        break
+    print("Loading .mat file...")
+    data = scipy.io.loadmat(args.mat_file)
 
-if mat_variable_name is None:
-    print("Error: Could not find a valid matrix variable in the .mat file.")
-    print(f"   Available keys: {data.keys()}")
-    sys.exit()
+    mat_variable_name = find_image_variable(data)
+    if mat_variable_name is None:
+        print("Error: Could not find a valid matrix variable in the .mat file.")
+        print(f"   Available keys: {data.keys()}")
+        sys.exit()
 
-print(f"Found data under variable name: '{mat_variable_name}'")
-puzzle_matrix = data[mat_variable_name]
-puzzle = puzzle_matrix.flatten().tolist()
+    print(f"Found data under variable name: '{mat_variable_name}'")
+    puzzle_matrix = data[mat_variable_name]
+    blocks = args.blocks or int(np.squeeze(data.get("blocks_per_side", BLOCKS_PER_SIDE)))
+    stages = args.stages.split(',')
+    print(f"Image {puzzle_matrix.shape[0]}x{puzzle_matrix.shape[1]} cut into a {blocks}x{blocks} grid")
 
-print("Solving puzzle with simulated annealing... (This may take a moment)")
-T_initial = 1000
-alpha = 0.99
-stopping_temp = 0.1
-solved_puzzle, min_cost = simulated_annealing(puzzle, T_initial, alpha, stopping_temp)
+    print("Solving puzzle... (This may take a moment)")
+    params = {
+        "T_initial": args.t_initial or (1000 if stages[0] == "anneal" else 50),
+        "alpha": args.alpha,
+        "stopping_temp": args.stopping_temp,
+        "batch": args.batch,
+        "progress": print_progress if args.progress_every else None,
+        "report_every": args.progress_every,
+        "checkpoint": args.checkpoint,
+        "checkpoint_every": args.checkpoint_every,
+        "run_info": {"mat_file": os.path.abspath(args.mat_file), "blocks": blocks},
+    }
+    tiles = split_tiles(puzzle_matrix, blocks)
+    tables = edge_tables(tiles)
+    placement = solve(tiles, tables, stages, params)
+    min_cost = placement_cost(placement, tables)
+    solved_puzzle = assemble(tiles, placement)
 
-scipy.io.savemat('answer.mat', {mat_variable_name: np.array(solved_puzzle).reshape(225, 225)})
+    scipy.io.savemat('answer.mat', {mat_variable_name: solved_puzzle})
+    remove_checkpoint(args.checkpoint)
 
-print("\n--- Process Complete! ---")
-print(f"Minimum cost found: {min_cost}")
-print("Solved puzzle saved to 'answer.mat'")
\ No newline at end of file
+    print("\n--- Process Complete! ---")
+    print(f"Minimum cost found: {min_cost}")
+    print("Solved puzzle saved to 'answer.mat'")
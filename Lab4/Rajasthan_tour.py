@@ -10,22 +10,26 @@ def td(tour):
 
 def simulated_annealing(cities,temperature=10000,cooling_rate=0.995,st=1e-8,maxiter=1000000):
     ct=cities[:]
-    bt=ct[:]
     n = len(cities)
+    current_distance = td(ct)
+    best_distance = current_distance
+    bt=ct[:]
 
     iteration = 1
     while temperature > st and iteration < maxiter:
         [i, j] = sorted(random.sample(range(n), 2))
-        new_tour = ct[:]
-        new_tour[i:j+1] = reversed(new_tour[i:j+1])
-        current_distance = td(ct)
-        new_distance = td(new_tour)
-        if new_distance < current_distance:
-            ct = new_tour
-            if new_distance < td(bt):
-                bt = new_tour
-        elif random.random() < math.exp((current_distance - new_distance) / temperature):
-            ct = new_tour
+        # Reversing ct[i..j] only replaces edges (a,b) and (c,d) with (a,c) and (b,d).
+        if i == 0 and j == n - 1:
+            delta = 0.0
+        else:
+            a, b, c, d = ct[i-1], ct[i], ct[j], ct[(j+1) % n]
+            delta = distance(a, c) + distance(b, d) - distance(a, b) - distance(c, d)
+        if delta < 0 or random.random() < math.exp(-delta / temperature):
+            ct[i:j+1] = reversed(ct[i:j+1])
+            current_distance += delta
+            if current_distance < best_distance:
+                best_distance = current_distance
+                bt = ct[:]
         temperature *= cooling_rate
         iteration += 1
 
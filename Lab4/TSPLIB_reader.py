@@ -0,0 +1,201 @@
+import glob
+import math
+import os
+import numpy as np
+
+# Parsed instances are cached next to the .tsp files so batch runs can skip text parsing.
+CACHE_DIR = ".tsp_cache"
+
+GEO_PI = 3.141592
+GEO_RADIUS = 6378.388
+
+class TSPInstance:
+    def __init__(self, name, edge_weight_type, coords=None, weights=None):
+        self.name = name
+        self.edge_weight_type = edge_weight_type  # None means plain (unrounded) Euclidean
+        self.coords = coords
+        self.weights = weights
+
+    @property
+    def dimension(self):
+        return len(self.coords) if self.weights is None else len(self.weights)
+
+def parse_tsplib(path):
+    """Splits a TSPLIB file into its 'KEY : VALUE' header and the tokens of each *_SECTION."""
+    header, sections, section = {}, {}, None
+    with open(path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if line == "EOF":
+                break
+            key = line.split(':')[0].strip().upper()
+            if key.endswith("_SECTION"):
+                section = key
+                sections[section] = []
+                continue
+            if ':' in line and key.replace('_', '').isalpha():
+                header[key] = line.split(':', 1)[1].strip()
+                section = None
+                continue
+            if section:
+                sections[section].extend(line.split())
+    return header, sections
+
+def explicit_weights(tokens, n, weight_format):
+    values = np.array(tokens, dtype=float)
+    if weight_format == "FULL_MATRIX":
+        return values[:n*n].reshape(n, n)
+    # Column-wise upper storage lists the same numbers as row-wise lower storage and vice versa.
+    weight_format = {
+        "UPPER_COL": "LOWER_ROW",
+        "LOWER_COL": "UPPER_ROW",
+        "UPPER_DIAG_COL": "LOWER_DIAG_ROW",
+        "LOWER_DIAG_COL": "UPPER_DIAG_ROW",
+    }.get(weight_format, weight_format)
+    offset = 0 if "DIAG" in weight_format else 1
+    if weight_format.startswith("UPPER"):
+        rows, cols = np.triu_indices(n, offset)
+    elif weight_format.startswith("LOWER"):
+        rows, cols = np.tril_indices(n, -offset)
+    else:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT: {weight_format}")
+    weights = np.zeros((n, n))
+    weights[rows, cols] = values[:len(rows)]
+    weights[cols, rows] = values[:len(rows)]
+    return weights
+
+def read_tsplib(path):
+    header, sections = parse_tsplib(path)
+    name = header.get("NAME", os.path.splitext(os.path.basename(path))[0])
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+    n = int(header["DIMENSION"]) if "DIMENSION" in header else None
+
+    if edge_weight_type == "EXPLICIT":
+        weights = explicit_weights(sections["EDGE_WEIGHT_SECTION"], n,
+                                   header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX"))
+        return TSPInstance(name, edge_weight_type, weights=weights)
+
+    if edge_weight_type not in ("EUC_2D", "CEIL_2D", "GEO", "ATT"):
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {edge_weight_type}")
+    tokens = sections.get("NODE_COORD_SECTION", [])
+    rows = np.array(tokens, dtype=float).reshape(-1, 3)
+    coords = np.zeros((n or len(rows), 2))
+    coords[rows[:, 0].astype(int) - 1] = rows[:, 1:]
+    return TSPInstance(name, edge_weight_type, coords=coords)
+
+def read_tour(path):
+    """Reads a .tour/.opt.tour file and returns the 0-based city order."""
+    _, sections = parse_tsplib(path)
+    tour = []
+    for token in sections.get("TOUR_SECTION", []):
+        if token == "-1":
+            break
+        tour.append(int(token) - 1)
+    return tour
+
+def load_instance(path, cache_dir=None):
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    # One directory per source file: a path separator cannot occur in the stem, so no
+    # other instance's entries can match.
+    instance_dir = os.path.join(cache_dir, os.path.splitext(os.path.basename(path))[0])
+    source_mtime = os.path.getmtime(path)
+
+    for cached in glob.glob(os.path.join(instance_dir, "*.npy")):
+        if os.path.getmtime(cached) < source_mtime:
+            continue
+        with open(os.path.join(instance_dir, "NAME"), 'r') as file:
+            name = file.read()
+        edge_weight_type, kind, _ = os.path.basename(cached).split('.')
+        array = np.load(cached, mmap_mode='r')
+        if kind == "weights":
+            return TSPInstance(name, edge_weight_type, weights=array)
+        return TSPInstance(name, edge_weight_type, coords=array)
+
+    instance = read_tsplib(path)
+    os.makedirs(instance_dir, exist_ok=True)
+    # NAME goes first so a cached array is never found without it.
+    with open(os.path.join(instance_dir, "NAME"), 'w') as file:
+        file.write(instance.name)
+    kind = "coords" if instance.weights is None else "weights"
+    array = instance.coords if instance.weights is None else instance.weights
+    np.save(os.path.join(instance_dir, f"{instance.edge_weight_type}.{kind}.npy"), array)
+    return instance
+
+def nint(x):
+    return np.floor(x + 0.5)
+
+def geo_radians(coords):
+    # TSPLIB reads DDD.MM as degrees and minutes.
+    degrees = np.trunc(coords)
+    return GEO_PI * (degrees + 5.0 * (coords - degrees) / 3.0) / 180.0
+
+def weight_matrix(instance):
+    kind = instance.edge_weight_type
+    if kind == "EXPLICIT":
+        return np.asarray(instance.weights)
+    xy = np.asarray(instance.coords, dtype=float)
+    if kind == "GEO":
+        rad = geo_radians(xy)
+        lat, lon = rad[:, 0], rad[:, 1]
+        q1 = np.cos(lon[:, None] - lon[None, :])
+        q2 = np.cos(lat[:, None] - lat[None, :])
+        q3 = np.cos(lat[:, None] + lat[None, :])
+        arc = np.arccos(np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0))
+        weights = np.trunc(GEO_RADIUS * arc + 1.0).astype(np.int64)
+        np.fill_diagonal(weights, 0)
+        return weights
+    diff = xy[:, None, :] - xy[None, :, :]
+    squared = (diff ** 2).sum(axis=-1)
+    if kind is None:
+        return np.sqrt(squared)
+    if kind == "EUC_2D":
+        return nint(np.sqrt(squared)).astype(np.int64)
+    if kind == "CEIL_2D":
+        return np.ceil(np.sqrt(squared)).astype(np.int64)
+    if kind == "ATT":
+        r = np.sqrt(squared / 10.0)
+        t = nint(r)
+        return np.where(t < r, t + 1, t).astype(np.int64)
+    raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {kind}")
+
+def weight_function(instance):
+    """Scalar version of weight_matrix() for instances too large for an n x n matrix."""
+    kind = instance.edge_weight_type
+    if kind == "EXPLICIT":
+        rows = np.asarray(instance.weights).tolist()
+        def dist(a, b):
+            return rows[a][b]
+        return dist
+    xy = np.asarray(instance.coords, dtype=float)
+    if kind == "GEO":
+        rad = geo_radians(xy)
+        lat, lon = rad[:, 0].tolist(), rad[:, 1].tolist()
+        def dist(a, b):
+            if a == b:
+                return 0
+            q1 = math.cos(lon[a] - lon[b])
+            q2 = math.cos(lat[a] - lat[b])
+            q3 = math.cos(lat[a] + lat[b])
+            cosine = max(-1.0, min(1.0, 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)))
+            return int(GEO_RADIUS * math.acos(cosine) + 1.0)
+        return dist
+    xs, ys = xy[:, 0].tolist(), xy[:, 1].tolist()
+    if kind is None:
+        def dist(a, b):
+            return math.hypot(xs[a] - xs[b], ys[a] - ys[b])
+    elif kind == "EUC_2D":
+        def dist(a, b):
+            return int(math.hypot(xs[a] - xs[b], ys[a] - ys[b]) + 0.5)
+    elif kind == "CEIL_2D":
+        def dist(a, b):
+            return math.ceil(math.hypot(xs[a] - xs[b], ys[a] - ys[b]))
+    elif kind == "ATT":
+        def dist(a, b):
+            r = math.sqrt(((xs[a] - xs[b]) ** 2 + (ys[a] - ys[b]) ** 2) / 10.0)
+            t = int(r + 0.5)
+            return t + 1 if t < r else t
+    else:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {kind}")
+    return dist
@@ -0,0 +1,181 @@
+import itertools
+import random
+from collections import deque
+
+# Moves work on a tour of city indices plus pos[city] = index in tour. A proposal returns
+# (delta, move) without touching the tour; move is None when nothing sensible was drawn.
+
+def reverse_segment(tour, pos, i, j):
+    n = len(tour)
+    if 2 * (j - i + 1) > n:
+        # Reversing the complement gives the same cycle and touches fewer cities.
+        i, j = j + 1, i - 1 + n
+        if i >= n:
+            i, j = i - n, j - n
+    if j < n:
+        tour[i:j+1] = tour[i:j+1][::-1]
+        changed = range(i, j+1)
+    else:
+        j -= n
+        segment = (tour[i:] + tour[:j+1])[::-1]
+        tour[i:] = segment[:n-i]
+        tour[:j+1] = segment[n-i:]
+        changed = itertools.chain(range(i, n), range(j+1))
+    for t in changed:
+        pos[tour[t]] = t
+
+def reverse_path(tour, pos, outer, u, v):
+    """Reverses the stretch of the tour from city u to city v; outer is the city next to u
+    outside the stretch, which tells which way round the tour the stretch runs."""
+    n = len(tour)
+    i, j = (pos[u], pos[v]) if tour[pos[u] - 1] == outer else (pos[v], pos[u])
+    reverse_segment(tour, pos, i, i + (j - i) % n)
+
+def move_segment(tour, pos, i, length, x, reverse):
+    """Cuts tour[i:i+length] (cyclically) and reinserts it right after city x, as at most
+    three reversals. The tour is the cycle S R T, with R running from q to x and T from y
+    to p; swapping S with the shorter of R and T puts it between x and y, and only the
+    cities of S and that stretch change position."""
+    n = len(tour)
+    first, last = tour[i], tour[(i + length - 1) % n]
+    p, q = tour[(i - 1) % n], tour[(i + length) % n]
+    y = tour[(pos[x] + 1) % n]
+    between = (pos[x] - i - length) % n + 1  # cities from q to x
+    if 2 * between <= n - length:
+        # p S R y -> p R^r S^r y -> p R S^r y.
+        reverse_path(tour, pos, p, first, x)
+        reverse_path(tour, pos, p, x, q)
+        if not reverse:
+            reverse_path(tour, pos, x, last, first)
+    else:
+        # x T S q -> x S^r T^r q, then put T back the right way round.
+        reverse_path(tour, pos, x, y, last)
+        if not reverse:
+            reverse_path(tour, pos, x, last, first)
+        reverse_path(tour, pos, first if reverse else last, p, y)
+
+def propose_2opt(tour, pos, dist, neighbours):
+    n = len(tour)
+    if neighbours:
+        # Pick a city and one of its near neighbours and try to make them adjacent.
+        a = random.randrange(n)
+        c = random.choice(neighbours[a])
+        i, j = sorted((pos[a], pos[c]))
+        i += 1
+    else:
+        [i, j] = sorted(random.sample(range(n), 2))
+    # Reversing tour[i..j] only replaces edges (a,b) and (c,d) with (a,c) and (b,d).
+    if i >= j or (i == 0 and j == n - 1):
+        return 0.0, None
+    a, b, c, d = tour[i-1], tour[i], tour[j], tour[(j+1) % n]
+    return dist(a, c) + dist(b, d) - dist(a, b) - dist(c, d), (i, j)
+
+def apply_2opt(tour, pos, move):
+    reverse_segment(tour, pos, *move)
+
+def propose_segment(tour, pos, dist, neighbours, length):
+    n = len(tour)
+    if n < length + 3:
+        return 0.0, None
+    i = random.randrange(n)
+    first, last = tour[i], tour[(i + length - 1) % n]
+    p, q = tour[(i - 1) % n], tour[(i + length) % n]
+    c = random.choice(neighbours[first]) if neighbours else random.randrange(n)
+    # Either c-first...last-succ(c) or pred(c)-last...first-c, so first ends up next to c.
+    reverse = random.random() < 0.5
+    x = tour[(pos[c] - 1) % n] if reverse else c
+    y = tour[(pos[x] + 1) % n]
+    if (pos[x] - i) % n < length or (pos[y] - i) % n < length:
+        return 0.0, None
+    removed = dist(p, first) + dist(last, q) + dist(x, y)
+    if reverse:
+        added = dist(p, q) + dist(x, last) + dist(first, y)
+    else:
+        added = dist(p, q) + dist(x, first) + dist(last, y)
+    return added - removed, (i, length, x, reverse)
+
+def propose_insertion(tour, pos, dist, neighbours):
+    return propose_segment(tour, pos, dist, neighbours, 1)
+
+def propose_or_opt(tour, pos, dist, neighbours):
+    return propose_segment(tour, pos, dist, neighbours, random.randint(2, 3))
+
+def propose_or3opt(tour, pos, dist, neighbours):
+    # Moving an arbitrary-length segment elsewhere is the pure sequential 3-opt exchange.
+    return propose_segment(tour, pos, dist, neighbours, random.randint(1, max(1, len(tour) // 2)))
+
+def apply_segment(tour, pos, move):
+    move_segment(tour, pos, *move)
+
+MOVES = {
+    "2opt": (propose_2opt, apply_2opt),
+    "insert": (propose_insertion, apply_segment),
+    "oropt": (propose_or_opt, apply_segment),
+    "3opt": (propose_or3opt, apply_segment),
+}
+
+def improve_2opt(tour, pos, dist, neighbours, a):
+    n = len(tour)
+    i = pos[a]
+    for forward in (True, False):
+        b = tour[(i + 1) % n] if forward else tour[(i - 1) % n]
+        d_ab = dist(a, b)
+        for c in neighbours[a]:
+            d_ac = dist(a, c)
+            if d_ac >= d_ab:
+                break
+            d = tour[(pos[c] + 1) % n] if forward else tour[(pos[c] - 1) % n]
+            if c == b or d == a:
+                continue
+            if d_ac + dist(b, d) - d_ab - dist(c, d) < -1e-9:
+                # Forward: a b ... c d -> a c ... b d.  Backward: d c ... b a -> d b ... c a.
+                start, end = (b, c) if forward else (c, b)
+                if pos[start] <= pos[end]:
+                    reverse_segment(tour, pos, pos[start], pos[end])
+                else:
+                    lo, hi = (d, a) if forward else (a, d)
+                    reverse_segment(tour, pos, pos[lo], pos[hi])
+                return (a, b, c, d)
+    return None
+
+def improve_or_opt(tour, pos, dist, neighbours, a, max_length=3):
+    n = len(tour)
+    i = pos[a]
+    for length in range(1, min(max_length, n - 3) + 1):
+        first, last = a, tour[(i + length - 1) % n]
+        p, q = tour[(i - 1) % n], tour[(i + length) % n]
+        gain = dist(p, first) + dist(last, q) - dist(p, q)
+        for c in neighbours[first]:
+            if dist(c, first) >= gain:
+                break
+            for reverse in (False, True):
+                x = tour[(pos[c] - 1) % n] if reverse else c
+                y = tour[(pos[x] + 1) % n]
+                if (pos[x] - i) % n < length or (pos[y] - i) % n < length:
+                    continue
+                if reverse:
+                    added = dist(x, last) + dist(first, y) - dist(x, y)
+                else:
+                    added = dist(x, first) + dist(last, y) - dist(x, y)
+                if added - gain < -1e-9:
+                    move_segment(tour, pos, i, length, x, reverse)
+                    return (p, q, x, y, first, last)
+    return None
+
+def local_search(tour, dist, neighbours):
+    """2-opt + Or-opt descent over neighbour lists, driven by a queue of don't-look bits."""
+    pos = [0] * len(tour)
+    for t, c in enumerate(tour):
+        pos[c] = t
+    queue = deque(tour)
+    queued = [True] * len(tour)
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        touched = improve_2opt(tour, pos, dist, neighbours, a) or improve_or_opt(tour, pos, dist, neighbours, a)
+        if touched:
+            for c in touched:
+                if not queued[c]:
+                    queued[c] = True
+                    queue.append(c)
+    return tour
@@ -1,86 +1,178 @@
+import argparse
+import functools
+import glob
 import math
+import os
 import random
+import statistics
 import time
-import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from Anneal_checkpoint import (Progress, checkpoint_interval, load_checkpoint, print_progress,
+                               remove_checkpoint, save_checkpoint)
+from TSP_moves import MOVES, local_search
+from TSPLIB_reader import TSPInstance, load_instance, read_tour, weight_function, weight_matrix
 
-def distance(city1, city2):
-    return math.sqrt((city1[0]-city2[0])**2+(city1[1]-city2[1])**2)
+# Above this many cities the n x n matrix gets too big; fall back to a KD-tree.
+MATRIX_LIMIT = 3000
 
-def td(tour):
-    return sum(distance(tour[i], tour[(i+1) % len(tour)]) for i in range(len(tour)))
+def precompute(instance, k=10):
+    n = instance.dimension
+    k = min(k, n - 1)
+    if instance.coords is None or n <= MATRIX_LIMIT:
+        matrix = weight_matrix(instance)
+        rows = matrix.tolist()
+        def dist(a, b):
+            return rows[a][b]
+        nearest = np.argsort(matrix, axis=1, kind='stable')[:, :k+1]
+    else:
+        from scipy.spatial import cKDTree
+        dist = weight_function(instance)
+        nearest = cKDTree(np.asarray(instance.coords)).query(instance.coords, k+1)[1]
+    if k <= 0:
+        return dist, None
+    neighbours = [[c for c in row if c != a][:k] for a, row in enumerate(nearest.tolist())]
+    return dist, neighbours
 
-def simulated_annealing(cities,temperature=10000,cooling_rate=0.999,st=1e-8,maxiter=1000000):
-    ct=cities[:]
-    bt=ct[:]
-    n = len(cities)
+def tour_length(tour, dist):
+    return sum(dist(tour[i], tour[(i+1) % len(tour)]) for i in range(len(tour)))
+
+def anneal(n, dist, neighbours=None, temperature=10000, cooling_rate=0.999, st=1e-8, maxiter=1000000,
+           moves=("2opt",), polish=False, progress=None, report_every=10000, checkpoint=None, checkpoint_every=None,
+           run_info=None):
+    # run_info identifies the run (instance, seed) to a checkpoint along with the schedule.
+    params = dict(run_info or {}, n=n, temperature=temperature, cooling_rate=cooling_rate, st=st,
+                  maxiter=maxiter, moves=tuple(moves))
+    if checkpoint and not checkpoint_every:
+        checkpoint_every = checkpoint_interval(temperature, cooling_rate, st, maxiter)
+    state = load_checkpoint(checkpoint, params)
+    if state:
+        ct, bt = state["tour"], state["best_tour"]
+        current_distance, best_distance = state["current_distance"], state["best_distance"]
+        iteration, temperature = state["iteration"], state["temperature"]
+    else:
+        ct = list(range(n))
+        current_distance = tour_length(ct, dist)
+        best_distance = current_distance
+        bt = ct[:]
+        iteration = 1
+    pos = [0] * n
+    for t, c in enumerate(ct):
+        pos[c] = t
+    moves = [MOVES[name] for name in moves]
 
-    iteration = 1
+    def snapshot():
+        return {"tour": ct, "best_tour": bt, "current_distance": current_distance,
+                "best_distance": best_distance, "iteration": iteration, "temperature": temperature}
+
+    accepted = 0
     while temperature > st and iteration < maxiter:
-        [i, j] = sorted(random.sample(range(n), 2))
-        new_tour = ct[:]
-        new_tour[i:j+1] = reversed(new_tour[i:j+1])
-        current_distance = td(ct)
-        new_distance = td(new_tour)
-        if new_distance < current_distance:
-            ct = new_tour
-            if new_distance < td(bt):
-                bt = new_tour
-        elif random.random() < math.exp((current_distance - new_distance) / temperature):
-            ct = new_tour
+        propose, apply = random.choice(moves)
+        delta, move = propose(ct, pos, dist, neighbours)
+        if move is not None and (delta < 0 or random.random() < math.exp(-delta / temperature)):
+            apply(ct, pos, move)
+            current_distance += delta
+            accepted += 1
+            if current_distance < best_distance:
+                best_distance = current_distance
+                bt = ct[:]
         temperature *= cooling_rate
         iteration += 1
-    return bt, td(bt)
+        if progress and iteration % report_every == 0:
+            progress(Progress(iteration, temperature, current_distance, best_distance, accepted / report_every))
+            accepted = 0
+        if checkpoint and iteration % checkpoint_every == 0:
+            save_checkpoint(checkpoint, snapshot(), params)
+    if checkpoint:
+        # A run stopped after this point resumes straight into the polish.
+        save_checkpoint(checkpoint, snapshot(), params)
+    if polish and neighbours:
+        local_search(bt, dist, neighbours)
+    return bt, tour_length(bt, dist)
 
-def read_tsp_file(file_path):
-    cities = []
-    with open(file_path, 'r') as file:
-        reading_coords = False
-        for line in file:
-            if "NODE_COORD_SECTION" in line:
-                reading_coords = True
-                continue
-            if reading_coords:
-                if line.strip() == "EOF":
-                    break
-                parts = line.strip().split()
-                if len(parts) == 3 and parts[0].isdigit():
-                    cities.append((float(parts[1]), float(parts[2])))
-    if not cities:
-        print(f"No cities found in {file_path}.")
-    return cities
+def simulated_annealing(cities,temperature=10000,cooling_rate=0.999,st=1e-8,maxiter=1000000,k=10):
+    dist, neighbours = precompute(TSPInstance("cities", None, coords=cities), k)
+    tour, length = anneal(len(cities), dist, neighbours, temperature, cooling_rate, st, maxiter)
+    return [cities[c] for c in tour], length
 
-def solve_tsp(name, cities):
+def run_restart(tsp_file, seed, params, checkpoint_dir=None, report_every=None):
+    random.seed(seed)
+    instance = load_instance(tsp_file)
     start_time = time.time()
-    _,best_distance = simulated_annealing(cities)
-    end_time = time.time()
+    dist, neighbours = precompute(instance)
+    if checkpoint_dir:
+        # One file per (instance, seed) so a preempted batch picks every restart up where it stopped.
+        params = dict(params, checkpoint=os.path.join(checkpoint_dir, f"{instance.name}.{seed}.ckpt"),
+                      run_info={"instance": instance.name, "seed": seed})
+    if report_every:
+        params = dict(params, report_every=report_every,
+                      progress=functools.partial(print_progress, label=f"{instance.name} seed {seed}: "))
+    _, best_distance = anneal(instance.dimension, dist, neighbours, **params)
+    remove_checkpoint(params.get("checkpoint"))
+    return tsp_file, best_distance, time.time() - start_time
+
+def run_batch(tsp_files, restarts=4, workers=None, seed=0, checkpoint_dir=None, report_every=None, **params):
+    if restarts < 1:
+        raise ValueError(f"restarts must be at least 1, got {restarts}")
+    # Parse every instance once up front so the workers only ever read the .npy cache.
+    for tsp_file in tsp_files:
+        load_instance(tsp_file)
+    if checkpoint_dir:
+        os.makedirs(checkpoint_dir, exist_ok=True)
 
-    print(f"Problem: {name}")
-    print(f"Number of cities: {len(cities)}")
-    print(f"Best distance found: {best_distance:.2f}")
-    print(f"Time taken: {end_time - start_time:.2f} seconds")
-    print("--------------------")
+    runs = {tsp_file: [] for tsp_file in tsp_files}
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_restart, tsp_file, seed + r, params, checkpoint_dir, report_every)
+                   for tsp_file in tsp_files for r in range(restarts)]
+        for future in as_completed(futures):
+            tsp_file, best_distance, seconds = future.result()
+            runs[tsp_file].append((best_distance, seconds))
+    wall_time = time.time() - start_time
 
-    return best_distance, end_time - start_time
+    summary = {}
+    for tsp_file, results in runs.items():
+        lengths = [length for length, _ in results]
+        seconds = [t for _, t in results]
+        summary[tsp_file] = (min(lengths), statistics.mean(lengths),
+                             statistics.pstdev(lengths), statistics.mean(seconds))
+    return summary, wall_time
 
-tsp_files = [
-    "/content/bcl380.tsp",
-    "/content/pbk411.tsp",
-    "/content/pbl395.tsp",
-    "/content/pbm436.tsp",
-    "/content/pbn423.tsp",
-]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve TSPLIB instances with simulated annealing.")
+    parser.add_argument("files", nargs="*", help="defaults to every .tsp file next to this script")
+    parser.add_argument("--restarts", type=int, default=4, help="independent seeded runs per instance")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first restart")
+    parser.add_argument("--maxiter", type=int, default=1000000)
+    parser.add_argument("--cooling-rate", type=float, default=0.999)
+    parser.add_argument("--moves", default="2opt,oropt", help=f"comma-separated subset of {','.join(MOVES)}")
+    parser.add_argument("--no-polish", action="store_true", help="skip the final 2-opt/Or-opt local search")
+    parser.add_argument("--progress-every", type=int, help="print progress every N iterations")
+    parser.add_argument("--checkpoint-dir", help="save checkpoints here and resume from any found")
+    parser.add_argument("--checkpoint-every", type=int,
+                        help="iterations between checkpoints; defaults to a twentieth of the schedule")
+    args = parser.parse_args()
+    if args.restarts < 1:
+        parser.error("--restarts must be at least 1")
 
-results = {}
+    tsp_files = args.files or sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.tsp")))
+    for tsp_file in tsp_files:
+        if not os.path.exists(tsp_file):
+            print(f"File not found: {tsp_file}")
+    tsp_files = [tsp_file for tsp_file in tsp_files if os.path.exists(tsp_file)]
 
-for tsp_file in tsp_files:
-    if os.path.exists(tsp_file):
-        cities = read_tsp_file(tsp_file)
-        if cities:
-            name = os.path.splitext(tsp_file)[0]
-            results[name] = solve_tsp(name, cities)
-    else:
-        print(f"File not found: {tsp_file}")
+    summary, wall_time = run_batch(tsp_files, args.restarts, args.workers, args.seed,
+                                   args.checkpoint_dir, args.progress_every,
+                                   checkpoint_every=args.checkpoint_every, maxiter=args.maxiter, cooling_rate=args.cooling_rate,
+                                   moves=tuple(args.moves.split(',')), polish=not args.no_polish)
 
-print("\nSummary of results:")
-for name, (distance, time) in results.items():
-    print(f"{name}: Distance = {distance:.2f}, Time = {time:.2f}s")
\ No newline at end of file
+    print(f"Summary of results ({args.restarts} restarts per instance):")
+    for tsp_file, (best, mean, spread, seconds) in summary.items():
+        name = os.path.splitext(tsp_file)[0]
+        line = f"{os.path.basename(name)}: Best = {best:.2f}, Mean = {mean:.2f}, Std = {spread:.2f}, Time/run = {seconds:.2f}s"
+        if os.path.exists(name + ".opt.tour"):
+            optimum = tour_length(read_tour(name + ".opt.tour"), weight_function(load_instance(tsp_file)))
+            line += f", Gap = {100 * (best - optimum) / optimum:.2f}%"
+        print(line)
+    print(f"Wall time: {wall_time:.2f}s on {args.workers} workers")